@@ -0,0 +1,203 @@
+"""Synthetic inputs for the benchmark suite: RSS feeds, a second-brain git
+repository, a books vault, and a local HTTP server standing in for the blog
+(feeds and OpenGraph pages) and the Listmonk API."""
+
+import json
+import random
+import re
+import subprocess
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)  # fixed, so results don't drift with the calendar
+
+
+def post_html(i: int) -> str:
+    """A Hugo-rendered post body: intro, a callout, an admonition, then sections."""
+    intro = (
+        f"<p>Post {i} is about <a href=\"https://www.ssp.sh/brain/data-modeling/\">data modeling</a> "
+        f"and [[Semantic Layer|semantic layers]], with <code>SELECT *</code> and <em>emphasis</em>.</p>\n"
+        f"<blockquote><p>[!note] Read first\nThis builds on [[Data Lake]].</p></blockquote>\n"
+        f"<p>{{{{< admonition note \"Hint\" >}}}}Shortcode body {i}{{{{< /admonition >}}}}</p>\n"
+        f"<p>Second paragraph of post {i}. " + "Some filler text about pipelines. " * 8 + "</p>\n"
+    )
+    sections = "".join(
+        f"<h2 id=\"s{s}\">Section {s}</h2>\n<p>" + "Body text that is cut off by the intro. " * 10 + "</p>\n"
+        for s in range(3)
+    )
+    return intro + sections
+
+
+def rss_feed(entries: int, base_url: str) -> bytes:
+    """RSS 2.0 feed with `entries` items, newest first, one every 12 hours."""
+    items = []
+    for i in range(entries):
+        published = format_datetime(NOW - timedelta(hours=12 * i))
+        link = f"{base_url}/posts/{i}/"
+        items.append(
+            f"<item><title>Post {i}</title><link>{link}</link><guid>{link}</guid>"
+            f"<pubDate>{published}</pubDate><description>{escape(post_html(i))}</description></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f"<title>Benchmark feed</title><link>{base_url}/</link>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode()
+
+
+def entry_date(i: int) -> datetime:
+    """Publication date of entry `i` in `rss_feed`, as naive UTC like the
+    dates `fetch_rss_feed` compares."""
+    return (NOW - timedelta(hours=12 * i)).replace(tzinfo=None)
+
+
+def og_page(i: int) -> bytes:
+    body = "".join(f"<p>Paragraph {p} of post {i}.</p>" for p in range(300))
+    return (
+        "<!doctype html><html><head><meta charset='utf-8'>"
+        f"<title>Post {i}</title>"
+        f"<meta property='og:title' content='Post {i}'>"
+        f"<meta property='og:image' content='https://www.ssp.sh/images/post-{i}.png'>"
+        f"</head><body><article>{body}</article></body></html>"
+    ).encode()
+
+
+def brain_repo(path: Path, commits: int, notes: int, seed: int = 1) -> Path:
+    """Git repository of markdown notes built with `git fast-import`, one
+    commit every few hours up to `NOW`, each appending to one to three notes."""
+    rng = random.Random(seed)
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+
+    content = {}
+    stream = []
+    start = NOW - timedelta(days=365)
+    step = timedelta(days=365) / commits
+    for c in range(commits):
+        ts = int((start + step * (c + 1)).timestamp())
+        message = f"update {c}".encode()
+        stream.append(
+            f"commit refs/heads/main\ncommitter Bench <bench@example.com> {ts} +0000\n"
+            f"data {len(message)}\n".encode() + message + b"\n"
+        )
+        for n in rng.sample(range(notes), rng.randint(1, 3)):
+            name = f"notes/note-{n}.md"
+            if name not in content:
+                description = f'description: "Note {n} in one line"\n' if n % 2 else ""
+                content[name] = f"---\ntitle: \"Note {n}\"\n{description}---\n\nNote {n} explains a topic.\n"
+            content[name] += "".join(f"- line {c}.{k} about [[Note {rng.randrange(notes)}]]\n"
+                                     for k in range(rng.randint(1, 60)))
+            data = content[name].encode()
+            stream.append(f"M 100644 inline {name}\ndata {len(data)}\n".encode() + data + b"\n")
+    subprocess.run(["git", "-C", str(path), "fast-import", "--quiet"], input=b"".join(stream), check=True)
+    subprocess.run(["git", "-C", str(path), "symbolic-ref", "HEAD", "refs/heads/main"], check=True)
+    subprocess.run(["git", "-C", str(path), "reset", "-q", "--hard"], check=True)
+    return path
+
+
+def books_vault(path: Path, books: int, seed: int = 1) -> Path:
+    """Book notes with inline dates, a summary callout and reading notes,
+    spread over the year before `NOW`."""
+    rng = random.Random(seed)
+    for folder in ("Read", "Reading", "Want to Read"):
+        (path / folder).mkdir(parents=True, exist_ok=True)
+    for b in range(books):
+        created = NOW - timedelta(days=rng.randrange(365))
+        finished = created + timedelta(days=rng.randrange(60))
+        folder = ("Read", "Reading", "Want to Read")[b % 3]
+        notes = "".join(f"- note {k} on [[Concept {k}|concept]] from book {b}\n" for k in range(rng.randint(0, 30)))
+        (path / folder / f"Book {b}.md").write_text(
+            f"- Author: [[Author {b % 97}]]\n- Genre: Tech\n"
+            f"- Created: {created:%Y-%m-%d}\n- Started reading: {created:%Y-%m-%d}\n"
+            f"- Finished reading: {finished:%Y-%m-%d}\n\n"
+            f"> [!summary] Summary\n> Book {b} in two sentences.\n> It is fictional.\n\n"
+            f"## Notes During Reading\n{notes}- ...\n\n## Quotes\n> A quote.\n"
+        )
+    return path
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # streaming readers hang up once they have what they need
+
+
+class FakeServer:
+    """Threaded HTTP server on 127.0.0.1 serving:
+
+    - `/feeds/<name>.xml`: registered feed bodies, with an ETag (304 on match)
+    - `/posts/<i>/`: OpenGraph pages
+    - `/api/lists`, `/api/campaigns`, `/api/campaigns/<id>/status`: Listmonk
+    """
+
+    def __init__(self, lists: int = 50):
+        self.feeds = {}
+        self.lists = [{"id": i + 1, "name": f"List {i}"} for i in range(lists)] + [{"id": 999, "name": "Bench"}]
+        self.campaigns = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=b"", content_type="application/json", headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, data):
+                self._send(200, json.dumps(data).encode())
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if m := re.fullmatch(r"/feeds/(\w+)\.xml", path):
+                    body = server.feeds[m.group(1)]
+                    etag = f'"{m.group(1)}-{len(body)}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        return self._send(304, headers={"ETag": etag})
+                    return self._send(200, body, "application/rss+xml", {"ETag": etag})
+                if m := re.fullmatch(r"/posts/(\d+)/", path):
+                    return self._send(200, og_page(int(m.group(1))), "text/html; charset=utf-8")
+                if path == "/api/lists":
+                    return self._json({"data": {"results": server.lists, "total": len(server.lists)}})
+                self._send(404)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path == "/api/campaigns":
+                    with server._lock:
+                        server.campaigns += 1
+                        campaign_id = server.campaigns
+                    return self._json({"data": {"id": campaign_id}})
+                self._send(404)
+
+            def do_PUT(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if m := re.fullmatch(r"/api/campaigns/(\d+)/status", self.path):
+                    return self._json({"data": {"id": int(m.group(1)), "status": "scheduled"}})
+                self._send(404)
+
+        self.httpd = _QuietServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
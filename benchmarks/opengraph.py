@@ -0,0 +1,102 @@
+"""Benchmark the streaming head-only OpenGraph extractor against the previous
+full-document BeautifulSoup parse.
+
+    uv run python -m benchmarks.opengraph                  # synthetic pages
+    uv run python -m benchmarks.opengraph --fixtures DIR   # saved *.html pages
+
+Both implementations read the page as a stream of text chunks (like
+`httpx.Response.iter_text()`), so "bytes read" is what would have been
+downloaded.
+"""
+
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import click
+from bs4 import BeautifulSoup
+
+from listmonk_rss import extract_opengraph
+
+CHUNK_SIZE = 64 * 1024
+
+
+def soup_opengraph(chunks) -> dict:
+    """The pre-streaming implementation: read everything, build the full tree."""
+    soup = BeautifulSoup("".join(chunks), 'html.parser')
+    og_data = {}
+    for meta in soup.find_all('meta'):
+        prop = meta.get('property', '')
+        if prop.startswith('og:'):
+            key = prop[3:]
+            og_data[key] = meta.get('content', '')
+    return og_data
+
+
+def write_synthetic_pages(directory: Path, count: int = 5, paragraphs: int = 2000) -> None:
+    """Blog-post-like pages of a few hundred KB with og tags in the head."""
+    body = "\n".join(
+        f"<p>Paragraph {i} with <a href='/brain/note-{i}/'>a link</a> and <code>code</code>.</p>"
+        for i in range(paragraphs)
+    )
+    for n in range(count):
+        (directory / f"post-{n}.html").write_text(
+            "<!doctype html><html><head><meta charset='utf-8'>"
+            f"<title>Post {n}</title>"
+            f"<meta property='og:title' content='Post {n}'>"
+            f"<meta property='og:image' content='https://www.ssp.sh/images/post-{n}.png'>"
+            "<meta property='og:type' content='article'>"
+            "<style>body { font-family: sans-serif; }</style>"
+            f"</head><body><article>{body}</article></body></html>"
+        )
+
+
+def _chunks(text: str, counter: list[int]):
+    for i in range(0, len(text), CHUNK_SIZE):
+        chunk = text[i:i + CHUNK_SIZE]
+        counter[0] += len(chunk.encode())
+        yield chunk
+
+
+def _measure(fn, text: str, rounds: int) -> dict:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(_chunks(text, [0]))
+        timings.append(time.perf_counter() - start)
+    counter = [0]
+    tracemalloc.start()
+    result = fn(_chunks(text, counter))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"result": result, "ms": statistics.median(timings) * 1000, "bytes": counter[0], "peak": peak}
+
+
+@click.command()
+@click.option("--fixtures", type=click.Path(exists=True, file_okay=False, path_type=Path), default=None,
+              help="Directory of saved *.html pages (default: generate synthetic ones)")
+@click.option("--rounds", default=20, show_default=True)
+def main(fixtures, rounds):
+    with tempfile.TemporaryDirectory() as tmp:
+        if fixtures is None:
+            fixtures = Path(tmp)
+            write_synthetic_pages(fixtures)
+        pages = sorted(fixtures.glob("*.html"))
+        click.echo(f"{'page':<24} {'impl':<10} {'KB read':>9} {'ms':>8} {'peak KB':>9}")
+        for page in pages:
+            text = page.read_text(encoding="utf-8", errors="ignore")
+            old = _measure(soup_opengraph, text, rounds)
+            new = _measure(extract_opengraph, text, rounds)
+            for name, m in (("soup", old), ("streaming", new)):
+                click.echo(
+                    f"{page.name[:24]:<24} {name:<10} {m['bytes'] / 1024:>9.1f} "
+                    f"{m['ms']:>8.2f} {m['peak'] / 1024:>9.1f}"
+                )
+            if old["result"] != new["result"]:
+                click.echo(f"  ! results differ: {old['result']} vs {new['result']}", err=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark campaign rendering: compiling `template.md.j2` from source with
+two whole-body `str.replace` passes (the previous implementation) against the
+cached environment with the Listmonk escaping as a finalize hook.
+
+    uv run python -m benchmarks.render                 # 2000 items
+    uv run python -m benchmarks.render --items 20000
+
+"cold" is a fresh process: the environment is built and the template is
+loaded from the bytecode cache instead of compiled. "warm" reuses the loaded
+template, as a multi-feed run does for feeds sharing a template.
+"""
+
+import statistics
+import time
+from datetime import datetime
+
+import click
+from jinja2 import Template
+
+from listmonk_rss import TEMPLATE_FILE, FeedItem, create_campaign_content, load_template, template_environment
+
+
+def replace_render(items: list) -> str:
+    """The previous implementation: compile from source, escape the whole body."""
+    content = Template(TEMPLATE_FILE.read_text()).render(items=items)
+    content = content.replace('{{', '&#123;&#123;')
+    content = content.replace('}}', '&#125;&#125;')
+    return content
+
+
+def cold_render(items: list) -> str:
+    template_environment.cache_clear()
+    return create_campaign_content(items)
+
+
+def warm_render(items: list) -> str:
+    return create_campaign_content(items)
+
+
+def synthetic_items(count: int) -> list[FeedItem]:
+    """Posts whose summaries carry Hugo shortcodes, which must be escaped."""
+    return [
+        FeedItem(
+            guid=f"https://www.ssp.sh/blog/post-{i}/",
+            title=f"Post {i}",
+            link=f"https://www.ssp.sh/blog/post-{i}/",
+            published=datetime(2026, 6, 1),
+            summary_md=(
+                f"Intro paragraph {i} with a [link](https://www.ssp.sh/brain/note-{i}/).\n\n"
+                f"{{{{< figure src=\"/images/post-{i}.png\" >}}}}\n\n"
+                + "More text about data engineering. " * 20
+            ),
+            image=f"https://www.ssp.sh/images/post-{i}.png",
+        )
+        for i in range(count)
+    ]
+
+
+def _time(fn, items: list, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(items)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+@click.command()
+@click.option("--items", default=2000, show_default=True)
+@click.option("--rounds", default=20, show_default=True)
+def main(items, rounds):
+    feed = synthetic_items(items)
+    load_template(TEMPLATE_FILE, campaign=True)  # populate the bytecode cache
+    expected = replace_render(feed)
+    click.echo(f"{'impl':<10} {'ms':>9}   ({items} items, {len(expected) / 1024:.0f} KB rendered)")
+    for name, fn in (("replace", replace_render), ("cold", cold_render), ("warm", warm_render)):
+        click.echo(f"{name:<10} {_time(fn, feed, rounds):>9.2f}")
+        if fn(feed) != expected:
+            click.echo(f"  ! {name} output differs from the previous implementation", err=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Import-time benchmark for the CLI entry points, via `python -X importtime`.
+
+    uv run python -m benchmarks.startup
+    uv run python -m benchmarks.startup --json startup.json
+
+Each path lists the modules it loads: the entry point itself plus the
+dependencies it imports on first use. `listmonk_rss.main` is what the cron
+job pays before it knows whether the feed changed; feedparser, markdownify
+and jinja2 only load once there is something to send. Every round runs in a
+fresh interpreter, and interpreter startup (site, encodings) is subtracted.
+"""
+
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import click
+
+ROOT = Path(__file__).parent.parent
+
+PATHS = {
+    "listmonk_rss.main": ["listmonk_rss"],
+    "newsletter send": ["newsletter", "listmonk_client", "listmonk_rss"],
+    "newsletter bsky-stats": ["newsletter", "duckdb"],
+    "newsletter gather": ["newsletter", "listmonk_rss", "feedparser", "markdownify", "jinja2", "duckdb"],
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _importtime(code: str) -> tuple[dict[str, int], float]:
+    """Cumulative µs of every top-level import, and the process wall time."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    top_level = {}
+    for line in result.stderr.splitlines():
+        m = _LINE.match(line)
+        if m and len(m.group(3)) == 1:  # one space: imported directly, not by another module
+            top_level[m.group(4)] = int(m.group(2))
+    return top_level, wall
+
+
+def measure(modules: list[str], rounds: int) -> dict:
+    import_ms, wall_ms = [], []
+    heaviest = defaultdict(list)
+    for _ in range(rounds):
+        base, base_wall = _importtime("pass")
+        top, wall = _importtime("import " + ", ".join(modules))
+        own = {name: us for name, us in top.items() if name not in base}
+        import_ms.append(sum(own.values()) / 1000)
+        wall_ms.append((wall - base_wall) * 1000)
+        for name, us in own.items():
+            heaviest[name].append(us / 1000)
+    top5 = sorted(((statistics.median(v), k) for k, v in heaviest.items()), reverse=True)[:5]
+    return {
+        "modules": modules,
+        "import_ms": round(statistics.median(import_ms), 2),
+        "wall_ms": round(statistics.median(wall_ms), 2),
+        "heaviest": {name: round(ms, 2) for ms, name in top5},
+    }
+
+
+@click.command()
+@click.option("--rounds", default=7, show_default=True)
+@click.option("--json", "json_path", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="Also write the results to this file")
+def main(rounds, json_path):
+    results = {}
+    click.echo(f"{'path':<24} {'import ms':>10} {'wall ms':>9}   heaviest top-level imports")
+    for path, modules in PATHS.items():
+        results[path] = m = measure(modules, rounds)
+        heaviest = ", ".join(f"{name} {ms:.1f}" for name, ms in m["heaviest"].items())
+        click.echo(f"{path:<24} {m['import_ms']:>10.1f} {m['wall_ms']:>9.1f}   {heaviest}")
+    if json_path:
+        json_path.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""Offline benchmark suite for the hot paths of both CLIs.
+
+    uv run python -m benchmarks.suite run                 # writes benchmarks/results/<commit>.json
+    uv run python -m benchmarks.suite run --quick         # smaller fixtures, for a quick check
+    uv run python -m benchmarks.suite compare OLD.json NEW.json
+
+Everything runs against generated fixtures (see `benchmarks.fixtures`) and a
+local HTTP server standing in for the blog and Listmonk, with CACHE_DIR in a
+temporary directory — no network, no credentials, and the real caches are
+left alone. "cold" cases start from empty caches on every round, "warm" cases
+reuse what the previous round left behind.
+"""
+
+import atexit
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import click
+
+WORK_DIR = Path(tempfile.mkdtemp(prefix="listmonk-rss-bench-"))
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+# must be set before the project modules read them at import
+os.environ["CACHE_DIR"] = str(WORK_DIR / "cache")
+os.environ["PUSHOVER_USER_KEY"] = ""
+os.environ["OG_CACHE_TTL_HOURS"] = "24"
+
+import listmonk_rss  # noqa: E402
+import newsletter  # noqa: E402
+from benchmarks import fixtures  # noqa: E402
+from benchmarks.render import synthetic_items  # noqa: E402
+from cache import CACHE_DIR  # noqa: E402
+from listmonk_client import ListmonkClient  # noqa: E402
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+SIZES = {
+    "full": {"feeds": [10, 100, 1000, 10000], "commits": 5000, "notes": 1500, "books": 3000, "render": [10, 1000]},
+    "quick": {"feeds": [10, 1000], "commits": 500, "notes": 200, "books": 300, "render": [10, 1000]},
+}
+
+
+def _clear_cache(*names: str) -> None:
+    """Remove the given entries under CACHE_DIR, or all of it."""
+    targets = [CACHE_DIR / name for name in names] if names else [CACHE_DIR]
+    for target in targets:
+        if target.is_dir():
+            shutil.rmtree(target)
+        else:
+            target.unlink(missing_ok=True)
+
+
+def _time(fn, rounds: int, setup=None) -> dict:
+    timings = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "rounds": rounds,
+    }
+
+
+def bench_feeds(server, sizes: list[int], rounds: int):
+    for entries in sizes:
+        name = f"feed{entries}"
+        server.feeds[name] = fixtures.rss_feed(entries, server.url)
+        url = f"{server.url}/feeds/{name}.xml"
+        last_update = fixtures.entry_date(min(10, entries))  # the newest 10 entries are new
+        for streaming in (False, True):
+            params = {"entries": entries, "streaming": streaming}
+            yield "fetch_rss_feed", {**params, "cache": "cold"}, _time(
+                lambda: listmonk_rss.fetch_rss_feed(url, last_update, streaming=streaming),
+                rounds, setup=_clear_cache,
+            )
+            yield "fetch_rss_feed", {**params, "cache": "warm"}, _time(
+                lambda: listmonk_rss.fetch_rss_feed(url, last_update, streaming=streaming), rounds,
+            )
+
+
+def bench_truncate(rounds: int, items: int = 1000):
+    summaries = [(fixtures.post_html(i), f"https://www.ssp.sh/blog/post-{i}/") for i in range(items)]
+    yield "truncate_to_intro", {"items": items}, _time(
+        lambda: [listmonk_rss.truncate_to_intro(content, link) for content, link in summaries], rounds,
+    )
+
+
+def bench_brain(commits: int, notes: int, rounds: int):
+    newsletter.BRAIN_CONTENT = fixtures.brain_repo(WORK_DIR / "brain", commits, notes)
+    since = fixtures.NOW.replace(tzinfo=None) - timedelta(days=60)
+    for from_git in (False, True):
+        params = {"commits": commits, "notes": notes, "from_git": from_git}
+        run = lambda: newsletter.gather_brain_updates(since, threshold=20, from_git=from_git)  # noqa: E731
+        yield "gather_brain_updates", {**params, "cache": "cold"}, _time(
+            run, rounds, setup=_clear_cache,
+        )
+        yield "gather_brain_updates", {**params, "cache": "warm"}, _time(run, rounds)
+
+
+def bench_books(books: int, rounds: int):
+    newsletter.BOOKS_DIR = fixtures.books_vault(WORK_DIR / "books", books)
+    newsletter.COPY_DIR = WORK_DIR / "copy"
+    since = fixtures.NOW.replace(tzinfo=None) - timedelta(days=60)
+
+    def cold():
+        _clear_cache("books.sqlite")
+        shutil.rmtree(newsletter.COPY_DIR, ignore_errors=True)
+
+    run = lambda: newsletter.gather_books(since, limit=5)  # noqa: E731
+    yield "gather_books", {"books": books, "cache": "cold"}, _time(run, rounds, setup=cold)
+    yield "gather_books", {"books": books, "cache": "warm"}, _time(run, rounds)
+
+
+def bench_render(sizes: list[int], rounds: int):
+    for items in sizes:
+        feed = synthetic_items(items)
+        yield "create_campaign_content", {"items": items}, _time(
+            lambda: listmonk_rss.create_campaign_content(feed), rounds,
+        )
+
+
+def bench_schedule(server, rounds: int):
+    content = listmonk_rss.create_campaign_content(synthetic_items(3))
+
+    def run():
+        with ListmonkClient(server.url, "bench", "token") as listmonk:
+            list_id = listmonk_rss.get_list_id(listmonk, "Bench")
+            listmonk_rss.schedule_campaign(listmonk, list_id, content, "[bench] Post 1, Post 2, Post 3")
+
+    yield "schedule_campaign", {"list_index": "cold"}, _time(
+        run, rounds, setup=lambda: _clear_cache("listmonk_lists.json"),
+    )
+    yield "schedule_campaign", {"list_index": "warm"}, _time(run, rounds)
+
+
+def _git(*args: str) -> str:
+    result = subprocess.run(["git", "-C", str(Path(__file__).parent), *args], capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+@click.group()
+def cli():
+    """Offline benchmarks with machine-readable results."""
+
+
+@cli.command()
+@click.option("--quick", is_flag=True, help="Smaller fixtures (seconds instead of minutes)")
+@click.option("--rounds", default=5, show_default=True)
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="Results file (default: benchmarks/results/<commit>.json)")
+def run(quick, rounds, output):
+    """Run every benchmark and write the results as JSON."""
+    logging.getLogger().setLevel(logging.WARNING)
+    sizes = SIZES["quick" if quick else "full"]
+    results = []
+    with fixtures.FakeServer() as server:
+        cases = [
+            bench_feeds(server, sizes["feeds"], rounds),
+            bench_truncate(rounds),
+            bench_brain(sizes["commits"], sizes["notes"], rounds),
+            bench_books(sizes["books"], rounds),
+            bench_render(sizes["render"], rounds),
+            bench_schedule(server, rounds),
+        ]
+        for case in cases:
+            for name, params, timing in case:
+                results.append({"name": name, "params": params, **timing})
+                click.echo(f"{name:<24} {json.dumps(params):<60} {timing['median_ms']:>10.2f} ms")
+
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    report = {
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": "quick" if quick else "full",
+        "results": results,
+    }
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"{commit}{'-quick' if quick else ''}.json"
+    output.write_text(json.dumps(report, indent=2))
+    click.echo(f"\nResults written: {output}")
+
+
+@cli.command()
+@click.argument("old", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("new", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--threshold", default=1.10, show_default=True,
+              help="Flag cases whose median grew by more than this factor")
+def compare(old, new, threshold):
+    """Compare two results files case by case."""
+    before, after = json.loads(old.read_text()), json.loads(new.read_text())
+    key = lambda r: (r["name"], json.dumps(r["params"], sort_keys=True))  # noqa: E731
+    baseline = {key(r): r for r in before["results"]}
+    click.echo(f"{before['commit']} → {after['commit']}")
+    regressions = 0
+    for r in after["results"]:
+        b = baseline.get(key(r))
+        if b is None:
+            continue
+        ratio = r["median_ms"] / b["median_ms"] if b["median_ms"] else float("inf")
+        flag = "  REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        click.echo(
+            f"{r['name']:<24} {json.dumps(r['params']):<60} "
+            f"{b['median_ms']:>10.2f} {r['median_ms']:>10.2f} ms  x{ratio:.2f}{flag}"
+        )
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    cli()
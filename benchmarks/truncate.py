@@ -0,0 +1,96 @@
+"""Golden-file check and microbenchmark for `truncate_to_intro`.
+
+    uv run python -m benchmarks.truncate                  # check, then time 2000 items
+    uv run python -m benchmarks.truncate --items 20000    # a large backfill
+    uv run python -m benchmarks.truncate --update         # rewrite the expected outputs
+
+`benchmarks/golden/truncate/` holds post bodies (`<name>.html`) and the exact
+markdown expected for them (`<name>.md`): callouts, admonitions, an admonition
+wrapping a callout, wikilinks, markdown sources and blank-line cleanup.
+Wikilinks resolve against the notes in `benchmarks/golden/brain/`. The check
+fails on any byte difference. The timing run cycles through the corpus
+like a backfill of that many posts, and splits the time into truncation,
+the markdown conversion and each cleanup step.
+"""
+
+import atexit
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+import click
+
+GOLDEN_DIR = Path(__file__).parent / "golden" / "truncate"
+WORK_DIR = Path(tempfile.mkdtemp(prefix="listmonk-rss-truncate-"))
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+# wikilinks resolve against a fixed brain, so the output doesn't depend on
+# the local BRAIN_CONTENT; must be set before the project modules read it
+os.environ["BRAIN_CONTENT"] = str(GOLDEN_DIR.parent / "brain")
+os.environ["CACHE_DIR"] = str(WORK_DIR)
+
+from listmonk_rss import CLEANUP_STEPS, intro_html, truncate_to_intro  # noqa: E402
+from listmonk_rss import _markdown_converter as markdown_converter  # noqa: E402
+
+
+def corpus() -> list[tuple[Path, str, str]]:
+    """(expected output file, content, link) for every golden input."""
+    return [
+        (path.with_suffix(".md"), path.read_text(), f"https://www.ssp.sh/blog/{path.stem}/")
+        for path in sorted(GOLDEN_DIR.glob("*.html"))
+    ]
+
+
+def check(update: bool = False) -> int:
+    """Compare every output with its golden file; returns the number of mismatches."""
+    mismatches = 0
+    for expected, content, link in corpus():
+        output = truncate_to_intro(content, link)
+        if update:
+            expected.write_text(output)
+        elif not expected.exists() or expected.read_text() != output:
+            mismatches += 1
+            click.echo(f"  ! {expected.name} differs from the golden output", err=True)
+    return mismatches
+
+
+def _time(fn, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+@click.command()
+@click.option("--items", default=2000, show_default=True, help="Posts per round, cycling through the corpus")
+@click.option("--rounds", default=5, show_default=True)
+@click.option("--update", is_flag=True, help="Write the current output as the expected one")
+def main(items, rounds, update):
+    mismatches = check(update)
+    if update:
+        click.echo(f"Golden files written: {GOLDEN_DIR}")
+        return
+    click.echo(f"{len(corpus())} golden files, {mismatches} mismatches")
+
+    posts = [(content, link) for _, content, link in islice(cycle(corpus()), items)]
+    intros = [intro_html(content) for content, _ in posts]
+    markdown = [markdown_converter().convert(intro).strip() for intro in intros]
+    stages = [
+        ("truncate_to_intro", lambda: [truncate_to_intro(*post) for post in posts]),
+        ("  intro_html", lambda: [intro_html(content) for content, _ in posts]),
+        ("  markdownify", lambda: [markdown_converter().convert(intro) for intro in intros]),
+    ] + [(f"  {step.__name__}", lambda step=step: [step(m) for m in markdown]) for step in CLEANUP_STEPS]
+    click.echo(f"{'stage':<24} {'ms':>9}   ({items} items)")
+    for name, fn in stages:
+        click.echo(f"{name:<24} {_time(fn, rounds):>9.2f}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
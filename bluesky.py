@@ -0,0 +1,224 @@
+"""Local store of our own Bluesky posts, synced from the public AppView.
+
+`sync_posts` pages through `app.bsky.feed.getAuthorFeed` with the `cursor`
+until it is past the requested window, and upserts every post into a DuckDB
+file keyed by URI. Once the store covers a window, later syncs only walk back
+BSKY_REFRESH_DAYS from the newest stored post — far enough to pick up new
+posts and refresh the counts of recent ones, which is where engagement still
+moves. Ranking is then a local query (`top_posts`), so it sees every post in
+the window, not just the last 100.
+
+Every sync also appends the current counts of each post it saw to the
+`engagement` table. That history answers questions like "what gained the most
+since the last newsletter" (`engagement_gained`, `engagement_by_day`) without
+any API call.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+
+from cache import CACHE_DIR
+
+if TYPE_CHECKING:
+    import duckdb  # imported on first use, it's the slowest import of the project
+
+load_dotenv()
+
+BSKY_HANDLE = os.getenv("BSKY_HANDLE", "ssp.sh")
+BSKY_DID = os.getenv("BSKY_DID", "did:plc:edglm4muiyzty2snc55ysuqx")
+BSKY_API = "https://public.api.bsky.app/xrpc/app.bsky.feed.getAuthorFeed"
+BSKY_PAGE_SIZE = 100  # API maximum
+BSKY_REFRESH_DAYS = int(os.getenv("BSKY_REFRESH_DAYS", 7))  # re-read counts of posts this recent
+BSKY_STORE = CACHE_DIR / "bluesky.duckdb"
+
+
+def connect_store() -> "duckdb.DuckDBPyConnection":
+    import duckdb
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(BSKY_STORE))
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS posts (
+            uri TEXT PRIMARY KEY,
+            author TEXT NOT NULL,
+            text TEXT,
+            created_at TIMESTAMP NOT NULL,
+            replies INTEGER NOT NULL,
+            reposts INTEGER NOT NULL,
+            likes INTEGER NOT NULL,
+            quotes INTEGER NOT NULL,
+            fetched_at TIMESTAMP NOT NULL
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS engagement (
+            uri TEXT NOT NULL,
+            fetched_at TIMESTAMP NOT NULL,
+            replies INTEGER NOT NULL,
+            reposts INTEGER NOT NULL,
+            likes INTEGER NOT NULL,
+            quotes INTEGER NOT NULL
+        )
+    """)
+    con.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    return con
+
+
+def _parse_ts(raw: str) -> datetime:
+    """Bluesky ISO timestamp → naive UTC datetime."""
+    dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def iter_author_feed(actor: str, until: datetime):
+    """Yield feed items newest first, following `cursor` until the feed is
+    older than `until`. Reposts sort by the time of the repost."""
+    from listmonk_client import shared_client
+
+    cursor = None
+    while True:
+        params = {"actor": actor, "limit": BSKY_PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        response = shared_client().get(BSKY_API, params=params)
+        response.raise_for_status()
+        page = response.json()
+        for item in page.get("feed", []):
+            yield item
+            sorted_at = (item.get("reason") or {}).get("indexedAt") or item["post"].get("indexedAt")
+            if sorted_at and _parse_ts(sorted_at) < until:
+                return
+        cursor = page.get("cursor")
+        if not cursor or not page.get("feed"):
+            return
+
+
+def _post_row(item: dict, fetched_at: datetime) -> tuple | None:
+    post = item["post"]
+    record = post.get("record", {})
+    if item.get("reason") or "createdAt" not in record:
+        return None  # a repost of someone else's post
+    return (
+        post["uri"],
+        post["author"]["handle"],
+        record.get("text"),
+        _parse_ts(record["createdAt"]),
+        post.get("replyCount", 0),
+        post.get("repostCount", 0),
+        post.get("likeCount", 0),
+        post.get("quoteCount", 0),
+        fetched_at,
+    )
+
+
+def sync_posts(con: "duckdb.DuckDBPyConnection", since: datetime, actor: str = BSKY_DID) -> int:
+    """Upsert posts from the author feed into the store. Returns the number of
+    posts written."""
+    meta = dict(con.execute("SELECT name, value FROM meta").fetchall())
+    covered_from = datetime.fromisoformat(meta["covered_from"]) if "covered_from" in meta else None
+    newest = con.execute("SELECT max(created_at) FROM posts").fetchone()[0]
+
+    if covered_from is not None and covered_from <= since and newest is not None:
+        until = max(since, newest - timedelta(days=BSKY_REFRESH_DAYS))
+    else:
+        until = since
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = [row for item in iter_author_feed(actor, until) if (row := _post_row(item, now))]
+    con.executemany("INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    # one engagement snapshot per post per sync, for `engagement_gained`
+    con.executemany(
+        "INSERT INTO engagement VALUES (?, ?, ?, ?, ?, ?)",
+        [(uri, fetched_at, replies, reposts, likes, quotes)
+         for uri, _author, _text, _created, replies, reposts, likes, quotes, fetched_at in rows],
+    )
+    if covered_from is None or until < covered_from:
+        con.execute("INSERT OR REPLACE INTO meta VALUES ('covered_from', ?)", [until.isoformat()])
+    logging.info(f"Bluesky: synced {len(rows)} posts back to {until:%Y-%m-%d}")
+    return len(rows)
+
+
+def top_posts(con: "duckdb.DuckDBPyConnection", since: datetime, top_n: int,
+              handle: str = BSKY_HANDLE) -> list[tuple]:
+    """(uri, text, created_at, engagement, replies, reposts, likes, quotes) of
+    our posts created on or after the day of `since`, most engaging first."""
+    return con.execute(
+        """
+        SELECT uri, text, created_at,
+               replies + reposts + likes + quotes AS engagement,
+               replies, reposts, likes, quotes
+        FROM posts
+        WHERE author = ? AND created_at >= ?
+        ORDER BY engagement DESC
+        LIMIT ?
+        """,
+        [handle, since.date(), top_n],
+    ).fetchall()
+
+
+def engagement_gained(con: "duckdb.DuckDBPyConnection", since: datetime, top_n: int,
+                      handle: str = BSKY_HANDLE) -> list[tuple]:
+    """(uri, text, created_at, gained, engagement, replies, reposts, likes,
+    quotes) of our posts, ranked by engagement gained since `since`.
+
+    The baseline is the last snapshot taken at or before `since`. Posts
+    created after `since` start from zero; older posts without an earlier
+    snapshot start from their first one, so they only count what was
+    observed to change."""
+    return con.execute(
+        """
+        WITH snapshots AS (
+            SELECT uri, fetched_at, replies + reposts + likes + quotes AS engagement
+            FROM engagement
+        ),
+        baseline AS (
+            SELECT uri,
+                   arg_max(engagement, fetched_at) FILTER (WHERE fetched_at <= $since) AS before,
+                   arg_min(engagement, fetched_at) AS first
+            FROM snapshots
+            GROUP BY uri
+        )
+        SELECT p.uri, p.text, p.created_at,
+               p.replies + p.reposts + p.likes + p.quotes
+                 - CASE WHEN p.created_at >= $since THEN 0 ELSE coalesce(b.before, b.first, 0) END
+                 AS gained,
+               p.replies + p.reposts + p.likes + p.quotes AS engagement,
+               p.replies, p.reposts, p.likes, p.quotes
+        FROM posts p LEFT JOIN baseline b USING (uri)
+        WHERE p.author = $handle
+        ORDER BY gained DESC, engagement DESC
+        LIMIT $top_n
+        """,
+        {"since": since, "handle": handle, "top_n": top_n},
+    ).fetchall()
+
+
+def engagement_by_day(con: "duckdb.DuckDBPyConnection", since: datetime,
+                      handle: str = BSKY_HANDLE) -> list[tuple]:
+    """(day, gained, posts) — total engagement gained per day across our
+    posts, from the difference between consecutive snapshots. A post's first
+    snapshot counts in full on the day it was taken."""
+    return con.execute(
+        """
+        WITH deltas AS (
+            SELECT e.uri, e.fetched_at,
+                   e.replies + e.reposts + e.likes + e.quotes
+                     - coalesce(lag(e.replies + e.reposts + e.likes + e.quotes)
+                                OVER (PARTITION BY e.uri ORDER BY e.fetched_at), 0) AS gained
+            FROM engagement e JOIN posts p USING (uri)
+            WHERE p.author = $handle
+        )
+        SELECT fetched_at::DATE AS day, sum(gained) AS gained, count(DISTINCT uri) FILTER (WHERE gained > 0) AS posts
+        FROM deltas
+        WHERE fetched_at >= $since
+        GROUP BY day
+        ORDER BY day
+        """,
+        {"since": since, "handle": handle},
+    ).fetchall()
@@ -0,0 +1,163 @@
+"""Resolve [[wikilinks]] against the published second brain.
+
+Hugo publishes every note in BRAIN_CONTENT under `/brain/<slugified filename
+stem>/`. The note index maps each filename stem, frontmatter `title` and
+`aliases` entry (case-insensitive) to that slug, so links by alias or title
+and links to renamed notes point at the real page. The index is persisted
+under CACHE_DIR keyed by the brain repository's HEAD commit and only rebuilt
+after it moves. Without BRAIN_CONTENT (e.g. in CI) every lookup misses and
+links fall back to slugifying the link text.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import subprocess
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from cache import CACHE_DIR
+
+load_dotenv()
+
+# Brain content lives in a git submodule under second-brain-public/content,
+# which has its own .git — git commands must run inside that submodule path.
+BRAIN_CONTENT = Path(os.getenv(
+    "BRAIN_CONTENT",
+    "/home/sspaeti/git/sspaeti.com/second-brain-public/content",
+))
+BRAIN_BASE_URL = "https://www.ssp.sh/brain/"
+
+_WIKILINK = re.compile(r"\[\[([^\]]+)\]\]")
+_WIKILINK_TEXT = re.compile(r"\[\[([^\]|]+\|)?([^\]]+)\]\]")
+_SLUG_DROP = re.compile(r"[^a-z0-9\s-]")
+_SLUG_DASHES = re.compile(r"[\s-]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def slugify(text: str) -> str:
+    slug = _SLUG_DROP.sub("", text.lower())
+    return _SLUG_DASHES.sub("-", slug).strip("-")
+
+
+def parse_frontmatter(text: str) -> dict:
+    """Flat `key: value` frontmatter. `aliases` is always a list, given
+    inline (`[a, b]` or a single value) or as a YAML block list."""
+    if not text.startswith("---"):
+        return {}
+    end = text.find("\n---", 4)
+    if end < 0:
+        return {}
+    out = {}
+    key = None
+    for line in text[3:end].splitlines():
+        item = line.strip()
+        if key == "aliases" and item.startswith("- "):
+            out[key].append(_unquote(item[2:]))
+            continue
+        if ":" not in line:
+            continue
+        k, _, v = line.partition(":")
+        key, v = k.strip(), v.strip()
+        if key == "aliases":
+            v = v.strip("[]")
+            out[key] = [_unquote(a) for a in v.split(",") if a.strip()] if v else []
+        else:
+            out[key] = _unquote(v)
+    return out
+
+
+def _unquote(value: str) -> str:
+    return value.strip().strip('"').strip("'")
+
+
+def _key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def _build_index(repo: Path) -> dict[str, str]:
+    """Lookup key → slug. Filename stems win over titles, titles over aliases."""
+    stems, titles, aliases = {}, {}, {}
+    for path in sorted(repo.rglob("*.md")):
+        slug = slugify(path.stem)
+        stems.setdefault(_key(path.stem), slug)
+        with path.open(encoding="utf-8", errors="ignore") as f:
+            head = f.readline()
+            if head.rstrip() == "---":
+                for line in f:
+                    head += line
+                    if line.rstrip() == "---":
+                        break
+        meta = parse_frontmatter(head)
+        if meta.get("title"):
+            titles.setdefault(_key(meta["title"]), slug)
+        for alias in meta.get("aliases", []):
+            aliases.setdefault(_key(alias), slug)
+    return {**aliases, **titles, **stems}
+
+
+def _head(repo: Path) -> str | None:
+    result = subprocess.run(["git", "-C", str(repo), "rev-parse", "HEAD"], capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+@functools.cache
+def note_index(repo: Path = BRAIN_CONTENT) -> dict[str, str]:
+    """The note index of `repo`, loaded from CACHE_DIR when it was built at
+    the current HEAD. Empty if `repo` doesn't exist."""
+    if not repo.is_dir():
+        return {}
+    commit = _head(repo)
+    path = CACHE_DIR / f"brain-index-{hashlib.sha1(str(repo.resolve()).encode()).hexdigest()[:16]}.json"
+    if commit and path.exists():
+        cached = json.loads(path.read_text())
+        if cached["commit"] == commit:
+            return cached["slugs"]
+    slugs = _build_index(repo)
+    if commit:  # outside git there is nothing to key the index by
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"commit": commit, "slugs": slugs}))
+    return slugs
+
+
+def resolve(target: str, repo: Path = BRAIN_CONTENT) -> str | None:
+    """Slug of the note a wikilink target (`Note`, `folder/Note.md`) points
+    to, or None if there is no such note."""
+    index = note_index(repo)
+    name = target.rsplit("/", 1)[-1].removesuffix(".md")
+    return index.get(_key(name))
+
+
+@functools.lru_cache(maxsize=4096)
+def _wikilink_markdown(inner: str, base_url: str, repo: Path, unresolved: str) -> str:
+    if "|" in inner:
+        target, display = inner.split("|", 1)
+        target, display = target.strip(), display.strip()
+    else:
+        target = display = inner.strip()
+    note, _, anchor = target.partition("#")
+    slug = resolve(note, repo) if note else None
+    if slug is not None:
+        return f"[{display}]({base_url}{slug}/{'#' + slugify(anchor) if anchor else ''})"
+    if unresolved == "text":
+        return display
+    return f"[{display}]({base_url}{slugify(target)}/)"
+
+
+def link_wikilinks(
+    content: str, base_url: str = BRAIN_BASE_URL, repo: Path = BRAIN_CONTENT, unresolved: str = "guess",
+) -> str:
+    """Convert [[wikilinks]] and [[target|alias]] to markdown links to the
+    notes they resolve to. Unresolved links are guessed from the slugified
+    target (`unresolved="guess"`) or reduced to their text (`"text"`)."""
+    if "[[" not in content:
+        return content
+    return _WIKILINK.sub(lambda m: _wikilink_markdown(m.group(1), base_url, repo, unresolved), content)
+
+
+def strip_wikilinks(content: str) -> str:
+    """[[target|alias]] → alias, [[target]] → target."""
+    return _WIKILINK_TEXT.sub(r"\2", content)
@@ -0,0 +1,277 @@
+"""Local on-disk caches shared by listmonk_rss.py and newsletter.py.
+
+Everything lives under CACHE_DIR (default `.cache/` next to this file,
+gitignored). Deleting the directory is always safe — it only costs a slower
+next run.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHE_DIR = Path(os.getenv("CACHE_DIR", Path(__file__).parent / ".cache"))
+
+OG_CACHE_TTL = float(os.getenv("OG_CACHE_TTL_HOURS", 24 * 7)) * 3600  # serve without any request
+OG_CACHE_MAX_ENTRIES = int(os.getenv("OG_CACHE_MAX_ENTRIES", 5000))  # LRU cap
+LIST_CACHE_TTL = float(os.getenv("LIST_CACHE_TTL_HOURS", 24)) * 3600
+
+
+def connect_db(name: str) -> sqlite3.Connection:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return sqlite3.connect(CACHE_DIR / name)
+
+
+class OpenGraphCache:
+    """URL → OpenGraph dict, with the validators needed for conditional GETs.
+
+    Entries younger than `ttl` are served as-is. Older entries are returned as
+    stale so the caller can revalidate them with If-None-Match /
+    If-Modified-Since. The least recently used rows are evicted once the table
+    holds more than `max_entries`.
+
+    Not thread-safe: look up and store from the calling thread, fetch in the
+    workers.
+    """
+
+    def __init__(self, ttl: float = OG_CACHE_TTL, max_entries: int = OG_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.db = connect_db("opengraph.sqlite")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS opengraph (
+                url TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS opengraph_lru ON opengraph (accessed_at)")
+
+    def get(self, url: str) -> dict | None:
+        """Cached entry for `url` as a dict with `data`, `etag`,
+        `last_modified` and `fresh`, or None on a miss."""
+        row = self.db.execute(
+            "SELECT data, etag, last_modified, fetched_at FROM opengraph WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        self.db.execute("UPDATE opengraph SET accessed_at = ? WHERE url = ?", (now, url))
+        data, etag, last_modified, fetched_at = row
+        return {
+            "data": json.loads(data),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": now - fetched_at < self.ttl,
+        }
+
+    def put(self, url: str, data: dict, etag: str | None = None, last_modified: str | None = None) -> None:
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO opengraph VALUES (?, ?, ?, ?, ?, ?)",
+            (url, json.dumps(data), etag, last_modified, now, now),
+        )
+
+    def close(self) -> None:
+        """Evict down to `max_entries` (least recently used first) and commit."""
+        self.db.execute(
+            """
+            DELETE FROM opengraph WHERE url IN (
+                SELECT url FROM opengraph ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ----- Feed snapshots -----
+
+def _feed_paths(feed_url: str) -> tuple[Path, Path]:
+    key = hashlib.sha1(feed_url.encode()).hexdigest()[:16]
+    return CACHE_DIR / "feeds" / f"{key}.json", CACHE_DIR / "feeds" / f"{key}.body"
+
+
+def load_feed_snapshot(feed_url: str) -> dict | None:
+    """Validators, content hash and newest entry date from the last fetch of
+    `feed_url`, plus the raw body (`None` if it wasn't kept)."""
+    meta_path, body_path = _feed_paths(feed_url)
+    if not meta_path.exists():
+        return None
+    snapshot = json.loads(meta_path.read_text())
+    snapshot["body"] = body_path.read_bytes() if body_path.exists() else None
+    return snapshot
+
+
+def save_feed_snapshot(feed_url: str, body: bytes | None, **meta) -> None:
+    meta_path, body_path = _feed_paths(feed_url)
+    meta_path.parent.mkdir(parents=True, exist_ok=True)
+    if body is None:
+        body_path.unlink(missing_ok=True)
+    else:
+        body_path.write_bytes(body)
+        meta["sha256"] = hashlib.sha256(body).hexdigest()
+    meta_path.write_text(json.dumps(meta, indent=2))
+
+
+# ----- Listmonk list index -----
+
+_LIST_INDEX_FILE = "listmonk_lists.json"
+
+
+def load_list_index(host: str, ttl: float = LIST_CACHE_TTL) -> dict | None:
+    """Cached list name → id map for `host`, or None if missing or expired."""
+    path = CACHE_DIR / _LIST_INDEX_FILE
+    if not path.exists():
+        return None
+    entry = json.loads(path.read_text()).get(host)
+    if not entry or time.time() - entry["fetched_at"] > ttl:
+        return None
+    return entry["lists"]
+
+
+def save_list_index(host: str, lists: dict) -> None:
+    path = CACHE_DIR / _LIST_INDEX_FILE
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    data = json.loads(path.read_text()) if path.exists() else {}
+    data[host] = {"fetched_at": time.time(), "lists": lists}
+    path.write_text(json.dumps(data, indent=2))
+
+
+# ----- Parsed note index -----
+
+class NoteIndex:
+    """Parsed metadata per file, valid as long as the file's key (mtime and
+    size, or a blob hash) is unchanged. `name` picks the database, so brain
+    notes and book notes keep separate indexes."""
+
+    def __init__(self, name: str):
+        self.db = connect_db(name)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS notes (
+                path TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+
+    def get_many(self, keys: dict) -> dict[str, dict]:
+        """{path: data} for every path whose stored key matches `keys[path]`."""
+        hits = {}
+        paths = list(keys)
+        for start in range(0, len(paths), 500):  # stay under SQLite's bound-variable limit
+            chunk = paths[start:start + 500]
+            rows = self.db.execute(
+                f"SELECT path, key, data FROM notes WHERE path IN ({', '.join('?' * len(chunk))})", chunk,
+            )
+            for path, key, data in rows:
+                if json.dumps(keys[path]) == key:
+                    hits[path] = json.loads(data)
+        return hits
+
+    def paths(self) -> set[str]:
+        return {path for (path,) in self.db.execute("SELECT path FROM notes")}
+
+    def prune(self, keep) -> int:
+        """Drop the rows of every path not in `keep` (deleted or renamed
+        files). Returns how many were dropped."""
+        gone = [(path,) for path in self.paths() if path not in keep]
+        self.db.executemany("DELETE FROM notes WHERE path = ?", gone)
+        return len(gone)
+
+    def put(self, path: str, key, data: dict) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO notes VALUES (?, ?, ?)",
+            (path, json.dumps(key), json.dumps(data)),
+        )
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+
+# ----- Git numstat per commit -----
+
+class NumstatCache:
+    """Per-commit `git log --numstat` output of one repository, keyed by SHA.
+
+    Commits are immutable, so once a commit is stored it never has to be read
+    from git again; `head` records how far the cache has been synced.
+    """
+
+    def __init__(self, repo: Path):
+        key = hashlib.sha1(str(repo.resolve()).encode()).hexdigest()[:16]
+        self.db = connect_db(f"numstat-{key}.sqlite")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS commits (
+                sha TEXT PRIMARY KEY,
+                committed_ts INTEGER NOT NULL,
+                authored TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS commits_ts ON commits (committed_ts);
+            CREATE TABLE IF NOT EXISTS numstat (
+                sha TEXT NOT NULL,
+                path TEXT NOT NULL,
+                added INTEGER NOT NULL,
+                deleted INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS numstat_sha ON numstat (sha);
+        """)
+
+    @property
+    def head(self) -> str | None:
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'head'").fetchone()
+        return row[0] if row else None
+
+    def known(self) -> set[str]:
+        return {sha for (sha,) in self.db.execute("SELECT sha FROM commits")}
+
+    def add(self, sha: str, committed_ts: int, authored: str, files: list[tuple[str, int, int]]) -> None:
+        self.db.execute("INSERT OR IGNORE INTO commits VALUES (?, ?, ?)", (sha, committed_ts, authored))
+        self.db.executemany(
+            "INSERT INTO numstat VALUES (?, ?, ?, ?)",
+            [(sha, path, added, deleted) for path, added, deleted in files],
+        )
+
+    def clear(self) -> None:
+        """Forget every commit, e.g. after the history was rewritten."""
+        self.db.executescript("DELETE FROM numstat; DELETE FROM commits; DELETE FROM meta;")
+
+    def set_head(self, head: str) -> None:
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('head', ?)", (head,))
+        self.db.commit()
+
+    def since(self, since_ts: float):
+        """(path, added, deleted, authored) rows for commits at or after
+        `since_ts`, most recent commit first."""
+        return self.db.execute(
+            """
+            SELECT n.path, n.added, n.deleted, c.authored
+            FROM numstat n JOIN commits c USING (sha)
+            WHERE c.committed_ts >= ?
+            ORDER BY c.committed_ts DESC, n.rowid
+            """,
+            (since_ts,),
+        )
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
@@ -0,0 +1,104 @@
+"""Incremental RSS/Atom parsing for large feeds.
+
+`feedparser` reads and parses the whole document before returning anything.
+`iter_feed_entries` instead feeds raw chunks into an `XMLPullParser` and yields
+one entry at a time, dropping each element once it has been read, so memory
+stays flat no matter how many items the feed carries. Entries are
+`FeedParserDict`s with the fields the rest of the code uses (`id`, `title`,
+`link`, `summary`, `published_parsed`). Unlike feedparser, summaries are not
+HTML-sanitized.
+"""
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import XMLPullParser
+
+from feedparser import FeedParserDict
+
+_ENTRY_TAGS = {"item", "entry"}
+_DATE_TAGS = ("pubDate", "published", "date", "updated")  # in order of preference
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_date(raw: str) -> datetime | None:
+    raw = raw.strip()
+    try:
+        dt = parsedate_to_datetime(raw)  # RSS: RFC 822
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))  # Atom / dc:date
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _to_entry(elem) -> FeedParserDict:
+    fields = {}
+    for child in elem:
+        name = _local(child.tag)
+        if name == "link" and child.get("href"):  # Atom
+            if child.get("rel", "alternate") == "alternate":
+                fields.setdefault("link", child.get("href"))
+        elif name not in fields:
+            fields[name] = (child.text or "").strip()
+
+    entry = FeedParserDict()
+    entry["title"] = fields.get("title", "")
+    entry["link"] = fields.get("link", "")
+    entry["id"] = fields.get("guid") or fields.get("id") or entry["link"]
+    entry["summary"] = fields.get("description") or fields.get("summary") or fields.get("content", "")
+    for tag in _DATE_TAGS:
+        dt = _parse_date(fields.get(tag, ""))
+        if dt is not None:
+            entry["published_parsed"] = dt.timetuple()
+            break
+    return entry
+
+
+def iter_feed_entries(chunks: Iterable[bytes]) -> Iterator[FeedParserDict]:
+    """Lazily yield feed entries from a stream of raw feed bytes."""
+    parser = XMLPullParser(events=("start", "end"))
+    stack = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            if _local(elem.tag) in _ENTRY_TAGS:
+                entry = _to_entry(elem)
+                # detach the finished entry so the tree never grows
+                if stack:
+                    stack[-1].remove(elem)
+                yield entry
+    parser.close()
+
+
+def iter_new_entries(entries: Iterable[FeedParserDict], last_update: datetime) -> Iterator[FeedParserDict]:
+    """Yield entries published after `last_update`.
+
+    While the entries seen so far are newest-first, the first entry at or
+    before the watermark ends the scan — everything after it is older. As
+    soon as the feed turns out not to be date-ordered, every entry is checked.
+    """
+    ordered = True
+    previous = None
+    for entry in entries:
+        if not entry.get("published_parsed"):
+            ordered = False
+            continue
+        published = datetime(*entry.published_parsed[:6])
+        if previous is not None and published > previous:
+            ordered = False
+        previous = published
+        if published > last_update:
+            yield entry
+        elif ordered:
+            return
@@ -0,0 +1,195 @@
+"""Pooled HTTP clients for Listmonk and the other APIs we talk to.
+
+One `ListmonkClient` per run keeps a single keep-alive connection for the
+list lookup, the campaign create and the status update. Everything else
+(Pushover, the GitHub variables API) goes through `shared_client()`.
+
+All clients use explicit timeouts and retry transient failures with
+exponential backoff, and record every call as a `tracing` span. Set HTTP2=1
+to negotiate HTTP/2 (needs the `h2` package, e.g. `uv add 'httpx[http2]'`).
+"""
+
+import atexit
+import logging
+import os
+import time
+
+import httpx
+from dotenv import load_dotenv
+
+from tracing import record
+
+load_dotenv()
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 30))  # seconds
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 3))
+HTTP_BACKOFF = 0.5  # seconds, doubled on every retry
+HTTP2 = os.getenv("HTTP2", "").lower() in ("1", "true", "yes")
+
+_RETRY_STATUS = {429, 502, 503, 504}
+_IDEMPOTENT = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Retry connection errors and 429/5xx responses with exponential backoff.
+
+    Non-idempotent requests (POST, PATCH) are only retried when the
+    connection could not be established, i.e. the server never saw them —
+    a retried campaign POST must not create a second campaign.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, retries: int = HTTP_RETRIES, backoff: float = HTTP_BACKOFF):
+        self.transport = transport
+        self.retries = retries
+        self.backoff = backoff
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in _IDEMPOTENT
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = self.transport.handle_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if last_attempt:
+                    raise
+            except httpx.TransportError:
+                if last_attempt or not idempotent:
+                    raise
+            else:
+                if last_attempt or not idempotent or response.status_code not in _RETRY_STATUS:
+                    return response
+                response.close()
+            delay = self.backoff * 2 ** attempt
+            logging.warning(f"{request.method} {request.url} failed, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class _TracedStream(httpx.SyncByteStream):
+    """Response body that counts its bytes and records the call's span once
+    the body has been read (or the response closed early)."""
+
+    def __init__(self, stream, request: httpx.Request, status: int, start: float):
+        self.stream = stream
+        self.request = request
+        self.status = status
+        self.start = start
+        self.bytes = 0
+        self.recorded = False
+
+    def __iter__(self):
+        for chunk in self.stream:
+            self.bytes += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        self.stream.close()
+        if not self.recorded:
+            self.recorded = True
+            record(f"http {self.request.url.host}", time.perf_counter() - self.start,
+                   method=self.request.method, path=self.request.url.path, status=self.status, bytes=self.bytes)
+
+
+class TracingTransport(httpx.BaseTransport):
+    """Records one span per request, retries included."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = self.transport.handle_request(request)
+        except httpx.TransportError as e:
+            record(f"http {request.url.host}", time.perf_counter() - start,
+                   method=request.method, path=request.url.path, error=type(e).__name__)
+            raise
+        response.stream = _TracedStream(response.stream, request, response.status_code, start)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+def make_http_client(http2: bool = HTTP2, timeout: float = HTTP_TIMEOUT,
+                     limits: httpx.Limits | None = None, **kwargs) -> httpx.Client:
+    """httpx.Client with our timeout, retry and (optional) HTTP/2 settings."""
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logging.warning("HTTP2 is set but the 'h2' package is not installed, using HTTP/1.1")
+            http2 = False
+    transport = httpx.HTTPTransport(http2=http2, limits=limits or httpx.Limits())
+    return httpx.Client(transport=TracingTransport(RetryTransport(transport)), timeout=timeout, **kwargs)
+
+
+_shared_client: httpx.Client | None = None
+
+
+def shared_client() -> httpx.Client:
+    """Process-wide client for one-off calls (Pushover, GitHub API)."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = make_http_client()
+        atexit.register(_shared_client.close)
+    return _shared_client
+
+
+class ListmonkClient:
+    """Authenticated, connection-pooled client for the Listmonk API."""
+
+    def __init__(self, host: str, api_user: str, api_token: str):
+        self.host = host
+        self.client = make_http_client(
+            base_url=host,
+            auth=(api_user, api_token),
+            headers={"Content-Type": "application/json"},
+        )
+
+    @classmethod
+    def from_env(cls) -> "ListmonkClient":
+        return cls(
+            host=os.getenv("LISTMONK_HOST"),
+            api_user=os.getenv("LISTMONK_API_USER"),
+            api_token=os.getenv("LISTMONK_API_TOKEN"),
+        )
+
+    def get_lists(self) -> list[dict]:
+        """All lists, following pagination if the server caps `per_page`."""
+        lists, page = [], 1
+        while True:
+            response = self.client.get("/api/lists", params={"page": page, "per_page": "all"})
+            response.raise_for_status()
+            data = response.json()["data"]
+            lists.extend(data["results"])
+            if not data["results"] or len(lists) >= data.get("total", 0):
+                return lists
+            page += 1
+
+    def create_campaign(self, data: dict) -> int:
+        response = self.client.post("/api/campaigns", json=data)
+        if response.status_code != 200:
+            logging.error(f"Campaign creation failed with status {response.status_code}")
+            logging.error(f"Response body: {response.text}")
+        response.raise_for_status()
+
+        parsed = response.json()
+        assert parsed.get("data",{}).get("id",None), "Cannot get the id of the created campaign"
+        return parsed["data"]["id"]
+
+    def set_campaign_status(self, campaign_id: int, status: str) -> dict:
+        response = self.client.put(f"/api/campaigns/{campaign_id}/status", json={"status": status})
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
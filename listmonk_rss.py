@@ -1,19 +1,36 @@
+import functools
 import os
+import hashlib
 import json
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import re
+import time
+import tomllib
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING
 
 import httpx
-import feedparser
-from jinja2 import Template
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from markdownify import markdownify as md
 import click
 import logging
 
+from brain import link_wikilinks
+from cache import CACHE_DIR, OpenGraphCache, load_feed_snapshot, load_list_index, save_feed_snapshot, save_list_index
+from listmonk_client import ListmonkClient, make_http_client, shared_client
+from state import STATE_BACKEND, entry_key, get_state_store
+from tracing import record, span, traced_run
+
+if TYPE_CHECKING:
+    # feedparser, markdownify and jinja2 are imported where they are first
+    # needed, so a run that finds no new entries never loads them
+    import feedparser
+    from jinja2 import Environment, Template
+
 logging.basicConfig(level=logging.INFO)  # Set to DEBUG, INFO, WARNING, ERROR, or CRITICAL
 
 # Load environment variables
@@ -21,187 +38,460 @@ load_dotenv()
 
 # Constants
 TEMPLATE_FILE = Path("template.md.j2")
+SUBJECT_PREFIX = "[ssp.sh] "
+FEED_TIMEOUT = 30  # seconds
+FEED_STREAMING = os.getenv("FEED_STREAMING", "").lower() in ("1", "true", "yes")
+OG_CONCURRENCY = int(os.getenv("OG_CONCURRENCY", 8))  # parallel OpenGraph requests
+OG_TIMEOUT = float(os.getenv("OG_TIMEOUT", 10))  # seconds, per OpenGraph request
+MAX_CAMPAIGN_ITEMS = int(os.getenv("MAX_CAMPAIGN_ITEMS", 20))  # more new items need --backfill (0: no limit)
+BACKFILL_BATCH_SIZE = int(os.getenv("BACKFILL_BATCH_SIZE", 10))  # items per campaign with --backfill
+BACKFILL_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", 4))  # campaigns created at once with --backfill
+
+
+@dataclass(slots=True)
+class FeedItem:
+    """A new feed entry, reduced to what the templates render. Built while
+    the feed is read, so the entry's full content and feedparser's detail
+    dicts are dropped right away instead of living until the render."""
+    guid: str
+    title: str
+    link: str
+    published: datetime  # naive UTC
+    summary_md: str  # markdown intro, see `truncate_to_intro`
+    image: str = ""  # OpenGraph image, set by `enrich_items`
+
+# callouts (> [!note] and its quoted continuation lines) and Hugo admonition
+# shortcodes, removed in one scan
+_CALLOUT = r"^> \[!\w+\].*$(?:\n^>.*$)*"
+_CALLOUTS = re.compile(_CALLOUT, re.MULTILINE)
+_CALLOUT_START = re.compile(r"^> \[!\w+\]", re.MULTILINE)
+_CALLOUTS_AND_ADMONITIONS = re.compile(
+    rf"(?P<callout>{_CALLOUT})|\{{\{{<\s*admonition[^>]*>\}}\}}(?s:.*?)\{{\{{<\s*/admonition\s*>\}}\}}",
+    re.MULTILINE,
+)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
 
 def convert_wikilinks(content: str, brain_base_url: str = "https://ssp.sh/brain/") -> str:
-    """Convert [[wikilinks]] and [[target|alias]] to markdown links."""
-    def slugify(text: str) -> str:
-        slug = text.lower()
-        slug = re.sub(r"[''']", "", slug)
-        slug = re.sub(r"[^a-z0-9\s-]", "", slug)
-        slug = re.sub(r"\s+", "-", slug)
-        slug = re.sub(r"-+", "-", slug)
-        slug = slug.strip("-")
-        return slug
-
-    def replace_wikilink(match):
-        inner = match.group(1)
-        if "|" in inner:
-            target, display = inner.split("|", 1)
-            target, display = target.strip(), display.strip()
-        else:
-            target = display = inner.strip()
-        url = f"{brain_base_url}{slugify(target)}/"
-        return f"[{display}]({url})"
+    """Convert [[wikilinks]] and [[target|alias]] to markdown links, resolved
+    against the brain note index where BRAIN_CONTENT is available."""
+    return link_wikilinks(content, brain_base_url)
 
-    return re.sub(r"\[\[([^\]]+)\]\]", replace_wikilink, content)
 
+def remove_callouts(content: str) -> str:
+    """Remove markdown callouts (> [!note], > [!tip], etc.) and Hugo admonition shortcodes."""
+    if "[!" not in content and "admonition" not in content:
+        return content
+    overlap = False
 
-def truncate_to_intro(content: str, link: str) -> str:
-    """Truncate content to everything before the first heading (h2 or ##), then convert to markdown."""
+    def remove(match):
+        nonlocal overlap
+        if match.lastgroup is None and _CALLOUT_START.search(match.group()):
+            overlap = True
+        return ""
+
+    cleaned = _CALLOUTS_AND_ADMONITIONS.sub(remove, content)
+    if overlap:
+        # an admonition wrapping a callout: strip the callouts first, as the
+        # admonition may end inside one
+        cleaned = _CALLOUTS_AND_ADMONITIONS.sub("", _CALLOUTS.sub("", content))
+    return cleaned
+
+
+def collapse_blank_lines(content: str) -> str:
+    """Clean up excess blank lines left behind."""
+    return _BLANK_LINES.sub("\n\n", content).strip()
+
+
+# applied in order to the markdown of each intro
+CLEANUP_STEPS = (remove_callouts, collapse_blank_lines, convert_wikilinks)
+
+
+@functools.cache
+def _markdown_converter():
+    from markdownify import MarkdownConverter
+    return MarkdownConverter(heading_style="ATX", strip=["img"])
+
+
+def intro_html(content: str) -> str:
+    """Everything before the first heading (h2 or ##)."""
     # Try HTML <h2> first (RSS feeds typically contain HTML)
     h2_pos = content.lower().find('<h2')
     if h2_pos > 0:
-        content = content[:h2_pos].rstrip()
-    else:
-        # Try markdown ## heading
-        lines = content.split('\n')
-        truncated_lines = []
-        for line in lines:
-            if line.strip().startswith('## '):
-                break
-            truncated_lines.append(line)
-        content = '\n'.join(truncated_lines).rstrip()
-
-    # Convert HTML to markdown
-    content = md(content, heading_style="ATX", strip=['img']).strip()
-
-    # Remove markdown callouts (> [!note], > [!tip], etc.)
-    content = re.sub(
-        r"^> \[![\w]+\].*$(?:\n^>.*$)*",
-        "",
-        content,
-        flags=re.MULTILINE,
-    )
+        return content[:h2_pos].rstrip()
+    # Try markdown ## heading
+    lines = content.split('\n')
+    truncated_lines = []
+    for line in lines:
+        if line.strip().startswith('## '):
+            break
+        truncated_lines.append(line)
+    return '\n'.join(truncated_lines).rstrip()
 
-    # Remove Hugo admonition shortcodes
-    content = re.sub(
-        r"\{\{<\s*admonition[^>]*>\}\}.*?\{\{<\s*/admonition\s*>\}\}",
-        "",
-        content,
-        flags=re.DOTALL,
-    )
 
-    # Clean up excess blank lines left behind
-    content = re.sub(r"\n{3,}", "\n\n", content).strip()
-
-    # Convert wikilinks to proper markdown links
-    content = convert_wikilinks(content)
+def truncate_to_intro(content: str, link: str) -> str:
+    """Truncate content to everything before the first heading (h2 or ##), then convert to markdown."""
+    # Convert only the intro to markdown, then clean it up
+    content = _markdown_converter().convert(intro_html(content)).strip()
+    for step in CLEANUP_STEPS:
+        content = step(content)
 
     content += f'\n\n[Continue reading...]({link})'
     return content
 
 
-def get_opengraph_data(url):
-    response = httpx.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    og_data = {}
-    for meta in soup.find_all('meta'):
-        prop = meta.get('property', '')
-        if prop.startswith('og:'):
-            key = prop[3:]
-            og_data[key] = meta.get('content', '')
-    return og_data
-
-
-def get_last_update() -> datetime:
-    """Get the last update timestamp from GitHub repo variable."""
-    github_token = os.getenv("GH_TOKEN")
-    repo = os.getenv("GH_REPOSITORY")
-    url = f"https://api.github.com/repos/{repo}/actions/variables/LAST_UPDATE"
-    
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {github_token}",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
-    
+class _OpenGraphParser(HTMLParser):
+    """Collects `<meta property="og:*">` tags and flags when the document
+    head is over, so the caller can stop reading the response."""
+
+    def __init__(self):
+        super().__init__()
+        self.og_data = {}
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+        elif tag == "meta":
+            attrs = dict(attrs)
+            prop = attrs.get("property") or ""
+            if prop.startswith("og:"):
+                self.og_data[prop[3:]] = attrs.get("content") or ""
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+
+
+def extract_opengraph(chunks: Iterable[str]) -> dict:
+    """Parse OpenGraph tags from an HTML text stream, stopping at `</head>`
+    (or `<body>`) instead of reading the whole document."""
+    parser = _OpenGraphParser()
+    for chunk in chunks:
+        # don't tokenize the rest of a chunk once the head is closed in it
+        head_end = chunk.lower().find("</head")
+        if head_end >= 0:
+            parser.feed(chunk[:head_end])
+            break
+        parser.feed(chunk)
+        if parser.done:
+            break
+    return parser.og_data
+
+
+def get_opengraph_data(url, client: httpx.Client | None = None):
+    return _stream_opengraph(url, client or httpx)[0]
+
+
+def _stream_opengraph(url: str, client, headers: dict | None = None) -> tuple[dict, httpx.Response]:
+    """Stream the page and only download it up to the end of `<head>`."""
+    with client.stream("GET", url, headers=headers, timeout=OG_TIMEOUT) as response:
+        og_data = extract_opengraph(response.iter_text())
+    return og_data, response
+
+
+def _revalidate_opengraph(url: str, client: httpx.Client, cached: dict | None) -> tuple[dict, httpx.Response | None]:
+    """Fetch OpenGraph data, sending the cached validators (if any) so an
+    unchanged page comes back as an empty 304. If the request fails or the
+    page answers with an error status, the stale cached data (or nothing)
+    is returned instead; a failed request comes back without a response."""
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["last_modified"]:
+        headers["If-Modified-Since"] = cached["last_modified"]
     try:
-        response = httpx.get(url, headers=headers)
+        og_data, response = _stream_opengraph(url, client, headers)
+    except httpx.HTTPError as e:
+        logging.error(f"OpenGraph fetch failed for {url}: {e}")
+        return (cached["data"] if cached else {}), None
+    if response.status_code != 200:
+        # unchanged (304), or an error page whose head is not the post's
+        return (cached["data"] if cached else {}), response
+    return og_data, response
+
+
+def get_opengraph_data_many(urls: list[str], max_workers: int = OG_CONCURRENCY) -> list[dict]:
+    """Fetch OpenGraph data for all `urls` over one pooled client, at most
+    `max_workers` requests in flight. Results are in the same order as `urls`;
+    duplicate URLs are only fetched once.
+
+    Fresh entries from the on-disk OpenGraph cache are used without touching
+    the network; stale ones are revalidated with a conditional GET."""
+    if not urls:
+        return []
+    unique = list(dict.fromkeys(urls))  # the same post can show up in several feeds
+    og_by_url = {}
+    with span("opengraph", urls=len(unique)) as attrs, OpenGraphCache() as og_cache:
+        pending = []
+        for url in unique:
+            cached = og_cache.get(url)
+            if cached and cached["fresh"]:
+                og_by_url[url] = cached["data"]
+            else:
+                pending.append((url, cached))
+        logging.info(f"OpenGraph: {len(unique) - len(pending)} cached, {len(pending)} to fetch")
+        attrs["fetched"] = len(pending)
+
+        if pending:
+            max_workers = max(1, min(max_workers, len(pending)))
+            limits = httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers)
+            with make_http_client(timeout=OG_TIMEOUT, limits=limits) as client:
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    fetched = pool.map(lambda p: _revalidate_opengraph(p[0], client, p[1]), pending)
+                    for (url, cached), (og, response) in zip(pending, fetched):
+                        og_by_url[url] = og
+                        if response is None or response.status_code not in (200, 304):
+                            continue
+                        # a 304 may omit the validators, keep the ones we sent
+                        etag = response.headers.get("etag") or (cached or {}).get("etag")
+                        last_modified = response.headers.get("last-modified") or (cached or {}).get("last_modified")
+                        og_cache.put(url, og, etag=etag, last_modified=last_modified)
+    return [og_by_url[url] for url in urls]
+
+
+def _feed_validators(snapshot: dict | None) -> dict:
+    headers = {}
+    if snapshot and snapshot.get("etag"):
+        headers["If-None-Match"] = snapshot["etag"]
+    if snapshot and snapshot.get("last_modified"):
+        headers["If-Modified-Since"] = snapshot["last_modified"]
+    return headers
+
+
+def _nothing_newer(snapshot: dict | None, last_update: datetime) -> bool:
+    """True if the snapshot's newest entry is not newer than `last_update`."""
+    newest = snapshot and snapshot.get("newest")
+    return bool(newest) and datetime.fromisoformat(newest) <= last_update
+
+
+def _fetch_feed(feed_url: str, last_update: datetime) -> "feedparser.FeedParserDict | None":
+    """Conditionally GET and parse the feed. Returns None without parsing when
+    the feed is unchanged since the last fetch (304 or same content hash) and
+    its newest entry is not newer than `last_update`."""
+    snapshot = load_feed_snapshot(feed_url)
+    client = shared_client()
+    response = client.get(feed_url, headers=_feed_validators(snapshot), follow_redirects=True, timeout=FEED_TIMEOUT)
+    if response.status_code == 304 and _nothing_newer(snapshot, last_update):
+        logging.info(f"Feed {feed_url} not modified since last fetch, newest entry {snapshot['newest']}")
+        return None
+    if response.status_code == 304 and snapshot["body"] is None:
+        # nothing cached to parse, fall back to a full download
+        response = client.get(feed_url, follow_redirects=True, timeout=FEED_TIMEOUT)
+
+    if response.status_code == 304:
+        body = snapshot["body"]
+        content_type = snapshot.get("content_type", "")
+    else:
         response.raise_for_status()
-        data = response.json()
-        return datetime.fromisoformat(data["value"])
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 404:
-            return datetime.min
-        raise
-
-
-def save_last_update(timestamp: datetime):
-    """Save the last update timestamp to GitHub repo variable."""
-    github_token = os.getenv("GH_TOKEN")
-    repo = os.getenv("GH_REPOSITORY")
-    url = f"https://api.github.com/repos/{repo}/actions/variables/LAST_UPDATE"
-    
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {github_token}",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
-    
-    data = {
-        "name": "LAST_UPDATE",
-        "value": timestamp.isoformat()
-    }
-    
-    response = httpx.patch(url, headers=headers, json=data)
-    response.raise_for_status()
-    logging.info(f"Saved last update timestamp to GitHub repo variable")
+        body = response.content
+        content_type = response.headers.get("content-type", "")
+        if (snapshot and hashlib.sha256(body).hexdigest() == snapshot.get("sha256")
+                and _nothing_newer(snapshot, last_update)):
+            logging.info(f"Feed {feed_url} unchanged since last fetch, newest entry {snapshot['newest']}")
+            return None
+
+    import feedparser
+    feed = feedparser.parse(
+        body,
+        response_headers={"content-location": str(response.url), "content-type": content_type},
+    )
+    published = [datetime(*e.published_parsed[:6]) for e in feed.entries if e.get("published_parsed")]
+    save_feed_snapshot(
+        feed_url, body,
+        etag=response.headers.get("etag") or (snapshot or {}).get("etag"),
+        last_modified=response.headers.get("last-modified") or (snapshot or {}).get("last_modified"),
+        content_type=content_type,
+        newest=max(published).isoformat() if published else None,
+    )
+    return feed
+
+
+def _stream_feed(feed_url: str, last_update: datetime, is_new, pool: Executor | None = None,
+                 stop_at: datetime | None = None) -> list[FeedItem] | None:
+    """Streaming counterpart of `_fetch_feed`: parse the response as it
+    arrives and stop reading once the entries are older than `stop_at`
+    (default: `last_update`). Returns the new items, or None when the feed
+    was not modified."""
+    stop_at = stop_at or last_update
+    snapshot = load_feed_snapshot(feed_url)
+    client = shared_client()
+    with client.stream("GET", feed_url, headers=_feed_validators(snapshot),
+                       follow_redirects=True, timeout=FEED_TIMEOUT) as response:
+        if response.status_code != 304:
+            response.raise_for_status()
+            return _read_new_entries(feed_url, response, stop_at, is_new, pool)
+        if _nothing_newer(snapshot, last_update):
+            logging.info(f"Feed {feed_url} not modified since last fetch, newest entry {snapshot['newest']}")
+            return None
+    # not modified, but it still holds entries newer than the watermark
+    with client.stream("GET", feed_url, follow_redirects=True, timeout=FEED_TIMEOUT) as response:
+        response.raise_for_status()
+        return _read_new_entries(feed_url, response, stop_at, is_new, pool)
+
+
+def _read_new_entries(feed_url: str, response: httpx.Response, stop_at: datetime, is_new,
+                      pool: Executor | None = None) -> list[FeedItem]:
+    from feedstream import iter_feed_entries, iter_new_entries
+    seen = 0
+    newest = None
+
+    def counted(entries):
+        nonlocal seen, newest
+        for entry in entries:
+            seen += 1
+            if entry.get("published_parsed"):
+                published = datetime(*entry.published_parsed[:6])
+                newest = max(newest or published, published)
+            yield entry
+
+    new_items = _feed_items(
+        iter_new_entries(counted(iter_feed_entries(response.iter_bytes())), stop_at), is_new, pool,
+    )
+    logging.info(f"Streamed {seen} entries for {feed_url}, {len(new_items)} new")
+    # the body isn't kept in streaming mode, only what the 304 check needs
+    save_feed_snapshot(
+        feed_url, None,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+        newest=newest.isoformat() if newest else None,
+    )
+    return new_items
 
 
-def fetch_rss_feed(feed_url: str, last_update: datetime) -> list:
+def _feed_items(entries: Iterable, is_new, pool: Executor | None = None) -> list[FeedItem]:
+    """A `FeedItem` for every entry `is_new(key, published)` accepts, built
+    as the entries come in. With a `pool`, the markdown intros are converted
+    there while the rest of the feed is still being read."""
+    items = []
+    intros = []
+    seconds = 0.0
+    for entry in entries:
+        published = datetime(*entry.published_parsed[:6])
+        key = entry_key(entry)
+        if not is_new(key, published):
+            continue
+        start = time.perf_counter()
+        summary = entry.get("summary", "")
+        if pool is not None:
+            intros.append(pool.submit(truncate_to_intro, summary, entry.link))
+        items.append(FeedItem(
+            guid=key,
+            title=entry.get("title", ""),
+            link=entry.link,
+            published=published,
+            summary_md="" if pool is not None else truncate_to_intro(summary, entry.link),
+            image=(entry.get("media_content") or [{}])[0].get("url", ""),
+        ))
+        seconds += time.perf_counter() - start
+    start = time.perf_counter()
+    for item, intro in zip(items, intros):
+        item.summary_md = intro.result()
+    record("markdownify", seconds + time.perf_counter() - start, items=len(items), pool=pool is not None)
+    return items
+
+
+def fetch_rss_feed(feed_url: str, last_update: datetime, streaming: bool = FEED_STREAMING,
+                   state=None) -> list[FeedItem]:
     """Fetch and parse RSS feed, returning new items since last update."""
-    feed = feedparser.parse(feed_url)
-    new_items = []
-    logging.info(f"There are in total {len(feed.entries)} entries for {feed_url}")
-    for entry in feed.entries:        
-        if datetime(*entry.published_parsed[:6]) > last_update:
-            og = get_opengraph_data(entry.link)
-            if og.get("image"):
-                entry.media_content=og.get("image")
-            entry.summary = truncate_to_intro(entry.summary, entry.link)
-            new_items.append(entry)
+    return enrich_items(fetch_new_entries(feed_url, last_update, streaming, state))
+
+
+def fetch_new_entries(feed_url: str, last_update: datetime, streaming: bool = FEED_STREAMING,
+                      state=None, pool: Executor | None = None) -> list[FeedItem]:
+    """New feed entries as `FeedItem`s with markdown intros, without
+    OpenGraph images yet.
+
+    With `streaming`, the feed is parsed incrementally and reading stops at
+    the first entry older than `last_update` (see `feedstream`). With a
+    `state` store, entries are filtered by `state.is_new` instead of the
+    watermark alone, and streaming reads down to `state.cutoff`. With a
+    process `pool`, the markdown conversion runs there."""
+    if state is None:
+        def is_new(key, published):
+            return published > last_update
+        stop_at = last_update
+    else:
+        is_new = state.is_new
+        stop_at = state.cutoff
 
-    return new_items
+    with span("feed", url=feed_url, streaming=streaming) as attrs:
+        if streaming:
+            items = _stream_feed(feed_url, last_update, is_new, pool, stop_at)
+        else:
+            feed = _fetch_feed(feed_url, last_update)
+            items = None
+            if feed is not None:
+                logging.info(f"There are in total {len(feed.entries)} entries for {feed_url}")
+                items = _feed_items(feed.entries, is_new, pool)
+        attrs["items"] = len(items) if items is not None else 0
+    return items or []
+
+
+def enrich_items(items: list[FeedItem]) -> list[FeedItem]:
+    """Add the OpenGraph image."""
+    # OpenGraph lookups are network-bound, so run them concurrently
+    og_data = get_opengraph_data_many([item.link for item in items])
+    for item, og in zip(items, og_data):
+        if og.get("image"):
+            item.image = og["image"]
+    return items
+
+
+def get_list_id(listmonk: ListmonkClient, list_name: str) -> int:
+    """Get list ID from list name, using the cached list index when the name
+    is in it and refreshing it from the Listmonk API otherwise."""
+    index = load_list_index(listmonk.host)
+    if index and list_name in index:
+        return index[list_name]
+
+    with span("listmonk lists"):
+        index = {lst["name"]: lst["id"] for lst in listmonk.get_lists()}
+    save_list_index(listmonk.host, index)
+    if list_name in index:
+        return index[list_name]
+
+    raise ValueError(f"List '{list_name}' not found")
+
+
+def escape_go_template(value) -> str:
+    """Finalize hook for campaign templates: escape Go template syntax for
+    Listmonk (which uses {{ }} for variables). HTML entities keep Listmonk
+    from parsing Hugo shortcodes in post summaries as templates."""
+    return str(value).replace('{{', '&#123;&#123;').replace('}}', '&#125;&#125;')
+
+
+@functools.cache
+def template_environment(directory: Path, campaign: bool = False) -> "Environment":
+    """Jinja environment for the templates in `directory`. Compiled templates
+    are kept in CACHE_DIR/jinja, so a template is only compiled again after
+    it changes. `campaign` adds the Listmonk escaping to every value."""
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+    bytecode_dir = CACHE_DIR / "jinja"
+    bytecode_dir.mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(directory),
+        bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir)),
+        finalize=escape_go_template if campaign else None,
+    )
 
 
-def get_list_id(host: str, api_user: str, api_token: str, list_name: str) -> int:
-    """Get list ID from list name using Listmonk API."""
-    url = f"{host}/api/lists"
-    auth=(api_user, api_token)
-    headers = {
-        "Content-Type": "application/json"
-    }
-    
-    with httpx.Client() as client:
-        response = client.get(url, headers=headers, auth=auth )
-        response.raise_for_status()
-        
-        # Find the list with matching name
-        lists = response.json()["data"]["results"]
-        for lst in lists:
-            if lst["name"] == list_name:
-                return lst["id"]
-        
-        raise ValueError(f"List '{list_name}' not found")
+def load_template(path: Path | str, campaign: bool = False) -> "Template":
+    path = Path(path).resolve()
+    return template_environment(path.parent, campaign).get_template(path.name)
 
 
-def create_campaign_content(items: list, template: Template) -> str:
-    """Generate campaign content using Jinja2 template."""
-    content = template.render(items=items)
-    # Escape Go template syntax for Listmonk (which uses {{ }} for variables)
-    # Use HTML entities to prevent Listmonk from parsing Hugo shortcodes as templates
-    content = content.replace('{{', '&#123;&#123;')
-    content = content.replace('}}', '&#125;&#125;')
-    return content
+def create_campaign_content(items: list[FeedItem], template_file: Path | str = TEMPLATE_FILE) -> str:
+    """Generate campaign content using Jinja2 template. Rendered values are
+    escaped for Listmonk; text written in the template itself is sent as-is."""
+    with span("render", items=len(items)):
+        return load_template(template_file, campaign=True).render(items=items)
 
 
-def schedule_campaign(host: str, api_user: str, api_token: str, list_id: int, content: str, subject: str, dry_run: bool = False):
-    """Send campaign draft using Listmonk API."""
-    url = f"{host}/api/campaigns"
-    auth=(api_user, api_token)
-    headers = {
-        "Content-Type": "application/json"
-    }
+def schedule_campaign(listmonk: ListmonkClient, list_id: int, content: str, subject: str, dry_run: bool = False,
+                      name: str = "RSS Update Newsletter", draft: bool = False) -> int:
+    """Send campaign draft using Listmonk API. Returns the campaign id. With
+    `draft`, the campaign is left as a draft instead of being scheduled."""
     current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M")
 
     # for the send time, we assume that the linkmonk server runs in UTC (this
@@ -216,7 +506,7 @@ def schedule_campaign(host: str, api_user: str, api_token: str, list_id: int, co
     send_datetime = datetime.now(timezone.utc) + timedelta(minutes=delay_mins)
     send_datetime = send_datetime.strftime("%Y-%m-%dT%H:%M:%SZ")
     data = {
-        "name" : f"RSS Update Newsletter, {current_datetime}",
+        "name" : f"{name}, {current_datetime}",
         "subject": subject,
         "lists": [list_id],
         "body": content,
@@ -228,107 +518,354 @@ def schedule_campaign(host: str, api_user: str, api_token: str, list_id: int, co
     # Debug logging (only visible when log level is DEBUG)
     logging.debug(f"Creating campaign with payload: {json.dumps({k: v if k != 'body' else f'{v[:100]}...' for k, v in data.items()}, indent=2)}")
 
-    with httpx.Client() as client:
-        response = client.post(url, json=data, headers=headers,auth=auth)
-        if response.status_code != 200:
-            logging.error(f"Campaign creation failed with status {response.status_code}")
-            logging.error(f"Response body: {response.text}")
-        response.raise_for_status()
-
-        parsed = response.json()
-        assert parsed.get("data",{}).get("id",None), "Cannot get the id of the created campaign"
-        campaign_id = parsed.get("data",{}).get("id")
+    if draft:
+        del data["send_at"]
 
+    with span("listmonk campaign", bytes=len(content.encode())):
+        campaign_id = listmonk.create_campaign(data)
         print(f"Campaign draft {campaign_id} successfully created!")
+        if draft:
+            return campaign_id
 
-        
-    url = f"{url}/{campaign_id}/status"
-    data = {"status": "scheduled"}
-    headers = {
-        "Content-Type": "application/json"
-    }
-    
-    with httpx.Client() as client:
-        response = client.put(url, json=data, auth=auth)
-        response.raise_for_status()
-
-        assert parsed.get("data",{}).get("id",None) == campaign_id, f"Cannot schedule campaign {campaign_id}"
-
-        print(f"Campaign {campaign_id} successfully scheduled with {delay_mins} mins delay!")
-
-        # Send Pushover notification
-        pushover_user_key = os.getenv("PUSHOVER_USER_KEY")
-        pushover_api_token = os.getenv("PUSHOVER_API_TOKEN")
-
-        if pushover_user_key and pushover_api_token:
-            response = httpx.post(
-                "https://api.pushover.net/1/messages.json",
-                data={
-                    "token": pushover_api_token,
-                    "user": pushover_user_key,
-                    "message": f"A new campaign has been successfully scheduled with {delay_mins} mins delay! Check if you want to review this before sending.",
-                    "title": "Newsletter for your blog"
-                },
-                headers={"Content-type": "application/x-www-form-urlencoded"}
-            )
-            response.raise_for_status()
+        parsed = listmonk.set_campaign_status(campaign_id, "scheduled")
+    assert parsed.get("data",{}).get("id",None) == campaign_id, f"Cannot schedule campaign {campaign_id}"
 
-    return True
+    print(f"Campaign {campaign_id} successfully scheduled with {delay_mins} mins delay!")
 
-@click.command()
-@click.option("--dry-run", is_flag=True, help="Create draft campaign with a 10-year delay and don't update last update time.")
-def main(dry_run: bool):
-    if dry_run:
-        print("*** This is a dry run")
+    notify_pushover(
+        f"A new campaign has been successfully scheduled with {delay_mins} mins delay! Check if you want to review this before sending.",
+        title="Newsletter for your blog",
+    )
 
+    return campaign_id
+
+
+def notify_pushover(message: str, title: str) -> None:
+    """Send a Pushover notification if PUSHOVER_USER_KEY/PUSHOVER_API_TOKEN are set."""
+    pushover_user_key = os.getenv("PUSHOVER_USER_KEY")
+    pushover_api_token = os.getenv("PUSHOVER_API_TOKEN")
+
+    if pushover_user_key and pushover_api_token:
+        response = shared_client().post(
+            "https://api.pushover.net/1/messages.json",
+            data={
+                "token": pushover_api_token,
+                "user": pushover_user_key,
+                "message": message,
+                "title": title
+            },
+            headers={"Content-type": "application/x-www-form-urlencoded"}
+        )
+        response.raise_for_status()
 
+def load_feeds_config(path: Path) -> list[dict]:
+    """Read a TOML file mapping feeds to lists (see feeds.example.toml).
+
+    Every `[[feeds]]` table needs `name`, `url` and `list`; `template` and
+    `subject_prefix` fall back to `[defaults]` and then to the single-feed
+    settings."""
+    config = tomllib.loads(path.read_text())
+    defaults = {"template": str(TEMPLATE_FILE), "subject_prefix": SUBJECT_PREFIX, **config.get("defaults", {})}
+    feeds = []
+    for feed in config.get("feeds", []):
+        feed = {**defaults, **feed}
+        missing = [key for key in ("name", "url", "list") if not feed.get(key)]
+        if missing:
+            raise click.UsageError(f"Feed {feed.get('name') or feed.get('url')} in {path} is missing {', '.join(missing)}")
+        feeds.append(feed)
+    if not feeds:
+        raise click.UsageError(f"No [[feeds]] in {path}")
+    names = [feed["name"] for feed in feeds]
+    if len(set(names)) != len(names):
+        raise click.UsageError(f"Feed names in {path} must be unique, they key each feed's state")
+    return feeds
+
+
+def _feed_from_env() -> dict:
+    """The classic single-feed setup from RSS_FEED / LIST_NAME."""
     assert os.getenv("RSS_FEED"), "No RSS feed given"
-    # Load template
-    template = Template(TEMPLATE_FILE.read_text())
-    
-    # Get last update time
-    last_update = get_last_update()
-    
-    # Fetch new RSS items
-    items = fetch_rss_feed(os.getenv("RSS_FEED"), last_update)
-    
+    return {
+        "name": None,  # uses the unnamed default state (LAST_UPDATE)
+        "url": os.getenv("RSS_FEED"),
+        "list": os.getenv("LIST_NAME"),
+        "template": str(TEMPLATE_FILE),
+        "subject_prefix": SUBJECT_PREFIX,
+    }
+
+
+def run_feeds(feeds: list[dict], dry_run: bool = False, streaming: bool = FEED_STREAMING,
+              state_backend: str = STATE_BACKEND) -> list[dict]:
+    """Fetch all feeds concurrently, enrich their new items in one batch and
+    create one campaign per feed in parallel. Each feed has its own state.
+    Returns one result dict per feed; a failing feed doesn't stop the others."""
+    results = [{"feed": feed["name"] or feed["url"], "list": feed["list"], "items": 0,
+                "campaign_id": None, "error": None} for feed in feeds]
+
+    def failed(i, stage, exc):
+        logging.error(f"{stage} failed for {results[i]['feed']}", exc_info=exc)
+        results[i]["error"] = f"{stage}: {exc}"
+
+    states = [None] * len(feeds)
+    for i, feed in enumerate(feeds):
+        try:
+            states[i] = get_state_store(state_backend, feed["name"])
+        except Exception as e:
+            failed(i, "State", e)
+
+    # Fetch new entries of all feeds at once
+    new_entries = [[] for _ in feeds]
+    with ThreadPoolExecutor(max_workers=len(feeds)) as pool:
+        futures = {
+            i: pool.submit(fetch_new_entries, feed["url"], states[i].watermark, streaming, states[i])
+            for i, feed in enumerate(feeds) if states[i] is not None
+        }
+        for i, future in futures.items():
+            try:
+                new_entries[i] = future.result()
+            except Exception as e:
+                failed(i, "Feed fetch", e)
+            results[i]["items"] = len(new_entries[i])
+            if MAX_CAMPAIGN_ITEMS and len(new_entries[i]) > MAX_CAMPAIGN_ITEMS:
+                # e.g. a missing LAST_UPDATE: everything since the first post is new
+                results[i]["error"] = (f"{len(new_entries[i])} new items, more than MAX_CAMPAIGN_ITEMS="
+                                       f"{MAX_CAMPAIGN_ITEMS} for one email; send them with --backfill")
+                logging.error(f"{results[i]['feed']}: {results[i]['error']}")
+                new_entries[i] = []
+
+    # One OpenGraph batch for everything, so shared posts are looked up once
+    try:
+        enrich_items([entry for entries in new_entries for entry in entries])
+    except Exception:
+        # find out which feed it was and leave only that one out
+        for i, entries in enumerate(new_entries):
+            try:
+                enrich_items(entries)
+            except Exception as e:
+                failed(i, "Enrichment", e)
+                new_entries[i] = []
+
+    campaigns = {}
+    with ListmonkClient.from_env() as listmonk:
+        for i, (feed, items) in enumerate(zip(feeds, new_entries)):
+            if not items:
+                if not results[i]["error"]:
+                    print(f"No new items found for {results[i]['feed']}, I keep the update as of my last state "
+                          f"'{states[i].watermark}' (UTC) in {states[i].name}.")
+                continue
+            try:
+                # resolved up front, so the list index cache is only written from here
+                list_id = get_list_id(listmonk, list_name=feed["list"])
+                content = create_campaign_content(items, feed["template"])
+            except Exception as e:
+                failed(i, "Campaign content", e)
+                continue
+            # Build dynamic subject from article titles
+            subject = feed["subject_prefix"] + ", ".join(item.title for item in items)
+            campaigns[i] = (list_id, content, subject)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(campaigns))) as pool:
+            futures = {
+                i: pool.submit(schedule_campaign, listmonk, list_id, content, subject, dry_run,
+                               name=f"RSS Update Newsletter ({results[i]['feed']})" if feeds[i]["name"] else "RSS Update Newsletter")
+                for i, (list_id, content, subject) in campaigns.items()
+            }
+            for i, future in futures.items():
+                try:
+                    results[i]["campaign_id"] = future.result()
+                except Exception as e:
+                    failed(i, "Scheduling", e)
+
+    # Update last update time only if not dry run and successful
+    for i, state in enumerate(states):
+        if state is None:
+            continue
+        try:
+            if results[i]["campaign_id"] and not dry_run:
+                state.mark_sent([item.guid for item in new_entries[i]], datetime.now())
+        except Exception as e:
+            failed(i, "State update", e)
+        finally:
+            state.close()
+    if dry_run and campaigns:
+        print("*** This is a dry run, I don't update the last_save state")
+    return results
+
+
+def batch_items(items: list[FeedItem], size: int = BACKFILL_BATCH_SIZE, per_week: bool = False) -> list[list[FeedItem]]:
+    """Items oldest first, split into batches of `size` items or one batch
+    per ISO week. Items published at the same time stay in one batch, so a
+    watermark at a batch's newest item never skips part of the next one."""
+    batches = []
+    for item in sorted(items, key=lambda item: item.published):
+        if batches:
+            last = batches[-1][-1]
+            if per_week:
+                same = last.published.isocalendar()[:2] == item.published.isocalendar()[:2]
+            else:
+                same = len(batches[-1]) < size or last.published == item.published
+            if same:
+                batches[-1].append(item)
+                continue
+        batches.append([item])
+    return batches
+
+
+def run_backfill(feeds: list[dict], dry_run: bool = False, streaming: bool = FEED_STREAMING,
+                 state_backend: str = STATE_BACKEND, batch_size: int = BACKFILL_BATCH_SIZE,
+                 per_week: bool = False, workers: int | None = None,
+                 concurrency: int = BACKFILL_CONCURRENCY) -> list[dict]:
+    """Announce everything newer than each feed's state as a series of
+    campaign drafts, oldest first, instead of one huge email.
+
+    The markdown conversion runs in a process pool while the feed is read.
+    Up to `concurrency` campaigns are created at a time, and the state
+    advances batch by batch in order (the watermark to the batch's newest
+    item), so an interrupted backfill resumes after the last batch committed.
+    A dry run only prints the batches."""
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for feed in feeds:
+            result = {"feed": feed["name"] or feed["url"], "list": feed["list"], "items": 0,
+                      "campaign_id": None, "campaigns": [], "error": None}
+            results.append(result)
+            state = None
+            try:
+                state = get_state_store(state_backend, feed["name"])
+                _backfill_feed(feed, state, result, pool, dry_run, streaming, batch_size, per_week, concurrency)
+            except Exception as e:
+                stage = "Backfill" if state is not None else "State"
+                logging.error(f"{stage} failed for {result['feed']}", exc_info=e)
+                result["error"] = f"{stage}: {e}"
+            finally:
+                if state is not None:
+                    state.close()
+    return results
+
+
+def _backfill_feed(feed: dict, state, result: dict, pool: Executor, dry_run: bool, streaming: bool,
+                   batch_size: int, per_week: bool, concurrency: int) -> None:
+    items = enrich_items(fetch_new_entries(feed["url"], state.watermark, streaming, state, pool))
+    result["items"] = len(items)
     if not items:
-        print(f"No new items found, I keep the update as of my last state '{last_update}' (UTC) in GitHub.")
+        print(f"No new items found for {result['feed']}, nothing to backfill.")
+        return
+    batches = batch_items(items, batch_size, per_week)
+    print(f"Backfilling {len(items)} items of {result['feed']} as {len(batches)} campaigns")
+    if dry_run:
+        for batch in batches:
+            print(f"  {batch[0].published:%Y-%m-%d} – {batch[-1].published:%Y-%m-%d}  "
+                  f"{len(batch):>3} items: {', '.join(item.title for item in batch)}")
+        print("*** This is a dry run, no campaigns are created and the state is not updated")
         return
-    
-    # Create campaign content
-    content = create_campaign_content(items, template)
-
-    # Build dynamic subject from article titles
-    titles = [item.title for item in items]
-    subject = "[ssp.sh] " + ", ".join(titles)
-
-    # Get list ID
-    list_id = get_list_id(
-        host=os.getenv("LISTMONK_HOST"),
-        api_user=os.getenv("LISTMONK_API_USER"),
-        api_token=os.getenv("LISTMONK_API_TOKEN"),
-        list_name=os.getenv("LIST_NAME")
-    )
 
-    # Schedule campaign
-    success = schedule_campaign(
-        host=os.getenv("LISTMONK_HOST"),
-        api_user=os.getenv("LISTMONK_API_USER"),
-        api_token=os.getenv("LISTMONK_API_TOKEN"),
-        list_id=list_id,
-        content=content,
-        subject=subject,
-        dry_run=dry_run
+    with ListmonkClient.from_env() as listmonk:
+        list_id = get_list_id(listmonk, list_name=feed["list"])
+        name = f"RSS Backfill ({result['feed']})" if feed["name"] else "RSS Backfill"
+        created = {}  # batch index → campaign id
+        committed = 0  # batches before this index are in the state
+        collected = set()
+        error = interrupted = None
+
+        def collect(future):
+            nonlocal committed, error
+            collected.add(future)
+            try:
+                created[futures[future]] = future.result()
+            except Exception as e:
+                # stop at the first failure, but keep what is in flight
+                error = error or e
+                for pending in futures:
+                    pending.cancel()
+                return
+            while committed in created:
+                batch = batches[committed]
+                state.mark_sent([item.guid for item in batch], batch[-1].published)
+                result["campaigns"].append(created[committed])
+                committed += 1
+
+        with ThreadPoolExecutor(max_workers=concurrency) as campaigns:
+            futures = {
+                campaigns.submit(
+                    schedule_campaign, listmonk, list_id,
+                    create_campaign_content(batch, feed["template"]),
+                    feed["subject_prefix"] + ", ".join(item.title for item in batch),
+                    name=f"{name} {batch[0].published:%Y-%m-%d} – {batch[-1].published:%Y-%m-%d}",
+                    draft=True,
+                ): i
+                for i, batch in enumerate(batches)
+            }
+            try:
+                for future in as_completed(futures):
+                    if not future.cancelled():
+                        collect(future)
+            except KeyboardInterrupt as e:
+                interrupted = e
+                for pending in futures:
+                    pending.cancel()
+                # the running requests still create their drafts: commit them
+                # or list them below, so the resume doesn't duplicate them silently
+                wait(futures)
+                for future in futures:
+                    if future not in collected and not future.cancelled():
+                        collect(future)
+        if error or interrupted:
+            ahead = [created[i] for i in sorted(created) if i > committed]
+            print(f"*** Backfill stopped after {committed} of {len(batches)} batches, run it again to resume."
+                  + (f" Delete the drafts created past that point first: {ahead}" if ahead else ""))
+            raise interrupted or error
+    result["campaign_id"] = result["campaigns"][-1]
+    notify_pushover(
+        f"Backfill of {result['feed']} created {len(batches)} campaign drafts. Review and schedule them in Listmonk.",
+        title="Newsletter for your blog",
     )
-    
-    # Update last update time only if not dry run and successful
-    if success and not dry_run:
-        save_last_update(datetime.now())
-    elif dry_run:
-        print("*** This is a dry run, I don't update the last_save state")
-    elif not success:
+
+
+def print_feed_summary(results: list[dict]) -> None:
+    click.echo(f"\n{'feed':<28} {'list':<24} {'new':>4}  result")
+    for r in results:
+        outcome = r["error"] or (f"campaign {r['campaign_id']}" if r["campaign_id"] else "nothing to send")
+        if r.get("campaigns") and not r["error"]:
+            # created concurrently, so the ids don't follow the batch order
+            outcome = f"{len(r['campaigns'])} campaign drafts ({', '.join(map(str, sorted(r['campaigns'])))})"
+        click.echo(f"{r['feed'][:28]:<28} {str(r['list'])[:24]:<24} {r['items']:>4}  {outcome}")
+
+
+@click.command()
+@click.option("--dry-run", is_flag=True, help="Create draft campaign with a 10-year delay and don't update last update time.")
+@click.option("--stream-feed/--no-stream-feed", default=FEED_STREAMING,
+              help="Parse the feed incrementally and stop at the first already-sent entry (default: FEED_STREAMING env).")
+@click.option("--state-backend", type=click.Choice(["github", "sqlite"]), default=STATE_BACKEND, show_default=True,
+              help="Where to keep the watermark and sent entries (default: STATE_BACKEND env).")
+@click.option("--config", "config_path", type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              default=os.getenv("FEEDS_CONFIG"),
+              help="TOML file mapping several feeds to lists (default: FEEDS_CONFIG env). Without it, RSS_FEED/LIST_NAME are used.")
+@click.option("--backfill", is_flag=True,
+              help="Announce all new items as a series of campaign drafts, oldest first, advancing the state after each one.")
+@click.option("--batch-size", type=click.IntRange(min=1), default=BACKFILL_BATCH_SIZE, show_default=True,
+              help="Items per campaign with --backfill (default: BACKFILL_BATCH_SIZE env).")
+@click.option("--per-week", is_flag=True, help="With --backfill, one campaign per week instead of --batch-size items.")
+@click.option("--workers", type=click.IntRange(min=1), default=None,
+              help="Processes for the markdown conversion with --backfill (default: CPU count).")
+@click.option("--profile", is_flag=True, help="Run under cProfile and print the hot spots and a per-stage timing table.")
+@click.option("--trace", "trace_file", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="Write per-stage and per-HTTP-call timing spans to this JSON file.")
+def main(dry_run: bool, stream_feed: bool, state_backend: str, config_path: Path | None, backfill: bool,
+         batch_size: int, per_week: bool, workers: int | None, profile: bool, trace_file: Path | None):
+    if dry_run:
+        print("*** This is a dry run")
+
+    with traced_run("listmonk_rss", profile, trace_file):
+        feeds = load_feeds_config(config_path) if config_path else [_feed_from_env()]
+        if backfill:
+            results = run_backfill(feeds, dry_run=dry_run, streaming=stream_feed, state_backend=state_backend,
+                                   batch_size=batch_size, per_week=per_week, workers=workers)
+        else:
+            results = run_feeds(feeds, dry_run=dry_run, streaming=stream_feed, state_backend=state_backend)
+    if config_path or backfill:
+        print_feed_summary(results)
+    if any(r["error"] for r in results):
         print("*** Something went wrong with scheduling the campaign")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
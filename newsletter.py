@@ -12,24 +12,43 @@ between sends keep showing the same backlog — nothing is "consumed" until you
 actually send.
 """
 
+import heapq
+import json
 import os
+import queue
 import re
 import shutil
 import subprocess
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 import click
-import duckdb
 from dotenv import load_dotenv
-from jinja2 import Template
 
-from listmonk_rss import (
-    fetch_rss_feed,
-    get_list_id,
-    schedule_campaign,
+from bluesky import (
+    BSKY_HANDLE,
+    connect_store,
+    engagement_by_day,
+    engagement_gained,
+    sync_posts,
+    top_posts,
 )
+from brain import BRAIN_BASE_URL, BRAIN_CONTENT, link_wikilinks, parse_frontmatter, slugify, strip_wikilinks
+from cache import NoteIndex, NumstatCache
+from tracing import span, traced_run
+
+# listmonk_rss (httpx, feedparser, markdownify, jinja2) and the Listmonk
+# client are imported inside the commands that use them, so e.g. `send` and
+# `bsky-stats` don't pay for the feed and template machinery at startup.
 
 load_dotenv()
 
@@ -40,21 +59,14 @@ COPY_DIR = ROOT / ".copy"  # snapshots of sensitive source dirs (gitignored)
 TEMPLATE_FILE = ROOT / "newsletter_template.md.j2"
 BSKY_FETCH_AMOUNT = 15
 
-# Brain content lives in a git submodule under second-brain-public/content,
-# which has its own .git — git log must run inside that submodule path.
-BRAIN_CONTENT = Path(os.getenv(
-    "BRAIN_CONTENT",
-    "/home/sspaeti/git/sspaeti.com/second-brain-public/content",
-))
 BOOKS_DIR = Path(os.getenv("BOOKS_DIR", "/home/sspaeti/Simon/SecondBrain/💡 Resources/📚 Books"))
-BRAIN_BASE_URL = "https://www.ssp.sh/brain/"
-
-BSKY_HANDLE = os.getenv("BSKY_HANDLE", "ssp.sh")
-BSKY_DID = os.getenv("BSKY_DID", "did:plc:edglm4muiyzty2snc55ysuqx")
 
 DEFAULT_THRESHOLD = 20  # min added lines to count a brain note as a meaningful update
 DEFAULT_LOOKBACK_DAYS = 60  # used when .last_newsletter doesn't exist yet
 MAJOR_BUCKET_LINES = 100  # brain notes with >= this many lines added go in "Major" bucket
+BOOKS_SNAPSHOT_MODE = os.getenv("BOOKS_SNAPSHOT_MODE", "copy")  # copy | reflink | hardlink
+BRAIN_FROM_GIT = os.getenv("BRAIN_FROM_GIT", "").lower() in ("1", "true", "yes")  # read notes at HEAD
+GATHER_TIMEOUT = int(os.getenv("GATHER_TIMEOUT", 120))  # seconds `gather` waits for all sources
 
 
 # ----- State -----
@@ -69,69 +81,62 @@ def save_last_newsletter_date(dt: datetime) -> None:
     LAST_NEWSLETTER_FILE.write_text(dt.isoformat())
 
 
-def slugify(text: str) -> str:
-    slug = text.lower()
-    slug = re.sub(r"[‘’']", "", slug)
-    slug = re.sub(r"[^a-z0-9\s-]", "", slug)
-    slug = re.sub(r"\s+", "-", slug)
-    slug = re.sub(r"-+", "-", slug)
-    return slug.strip("-")
-
-
 # ----- Second Brain (git-based change detection) -----
 
-def gather_brain_updates(since: datetime, threshold: int) -> list[dict]:
-    """Notes in BRAIN_CONTENT with at least `threshold` added lines since `since`."""
+def gather_brain_updates(since: datetime, threshold: int, from_git: bool = BRAIN_FROM_GIT) -> list[dict]:
+    """Notes in BRAIN_CONTENT with at least `threshold` added lines since `since`.
+
+    With `from_git`, notes are read as committed at HEAD (one `git cat-file
+    --batch` process) instead of from the working tree, and the history of
+    renamed notes is credited to their current path. That matches what Hugo
+    publishes, regardless of uncommitted edits."""
     if not BRAIN_CONTENT.exists():
         click.echo(f"BRAIN_CONTENT {BRAIN_CONTENT} not found, skipping brain updates", err=True)
         return []
 
-    result = subprocess.run(
-        [
-            "git", "-C", str(BRAIN_CONTENT), "log",
-            f"--since={since.strftime('%Y-%m-%d %H:%M:%S')}",
-            "--numstat", "--format=__COMMIT__%H|%ai",
-        ],
-        capture_output=True, text=True, check=True,
-    )
+    numstat = NumstatCache(BRAIN_CONTENT)
+    try:
+        _sync_numstat_cache(numstat)
+        rows = numstat.since(since.timestamp()).fetchall()
+    finally:
+        numstat.close()
 
     stats = defaultdict(lambda: {"added": 0, "deleted": 0, "last_commit_date": ""})
-    current_date = ""
-    for line in result.stdout.splitlines():
-        if line.startswith("__COMMIT__"):
-            _, _, rest = line.partition("__COMMIT__")
-            _, _, current_date = rest.partition("|")
-            continue
-        parts = line.split("\t")
-        if len(parts) != 3 or not parts[0].isdigit():
-            continue
-        added, deleted, path = int(parts[0]), int(parts[1]), parts[2]
+    renames = {}  # old path → path at HEAD
+    for path, added, deleted, commit_date in rows:
+        if from_git:
+            # rows are newest first, so a rename is seen before the history
+            # of its old path and that history is credited to the new one
+            if " => " in path:
+                old_path, new_path = _rename_paths(path)
+                path = renames[old_path] = renames.get(new_path, new_path)
+            else:
+                path = renames.get(path, path)
         if not path.endswith(".md"):
             continue
         s = stats[path]
         s["added"] += added
         s["deleted"] += deleted
-        if not s["last_commit_date"]:  # git log is reverse-chrono, first seen = most recent
-            s["last_commit_date"] = current_date
+        if not s["last_commit_date"]:  # rows are newest commit first, first seen = most recent
+            s["last_commit_date"] = commit_date
+
+    if from_git:
+        notes = _brain_note_meta_from_git([path for path, s in stats.items() if s["added"] >= threshold])
+        candidates = list(notes)  # deleted at HEAD → not in notes
+    else:
+        candidates = [
+            path for path, s in stats.items()
+            if s["added"] >= threshold and (BRAIN_CONTENT / path).exists()  # skip deleted files
+        ]
+        notes = _brain_note_meta(candidates)
 
     updates = []
-    for path, s in stats.items():
-        if s["added"] < threshold:
-            continue
-        full = BRAIN_CONTENT / path
-        if not full.exists():
-            continue  # file was deleted
-        meta = _parse_brain_frontmatter(full)
-        # Hugo derives the URL from the filename stem (slugified), not the
-        # frontmatter title. E.g. file "zen mode for writing.md" with title
-        # "Zen Mode for Writing (Obsidian, Neovim)" → /brain/zen-mode-for-writing/
-        slug = slugify(Path(path).stem)
-        title = meta.get("title") or Path(path).stem.title()
-        description = meta.get("description") or _first_sentence(full)
+    for path in candidates:
+        s, meta = stats[path], notes[path]
         updates.append({
-            "title": title,
-            "description": description,
-            "url": f"{BRAIN_BASE_URL}{slug}/",
+            "title": meta["title"] or Path(path).stem.title(),
+            "description": meta["description"] or meta["first_sentence"],
+            "url": f"{BRAIN_BASE_URL}{meta['slug']}/",
             "added": s["added"],
             "deleted": s["deleted"],
             "last_commit_date": s["last_commit_date"][:10],
@@ -142,9 +147,160 @@ def gather_brain_updates(since: datetime, threshold: int) -> list[dict]:
     return updates
 
 
-def _first_sentence(path: Path, max_chars: int = 200) -> str:
+def _parse_brain_note(path: str, text: str) -> dict:
+    """Everything the draft needs from one note, from a single read."""
+    meta = parse_frontmatter(text)
+    return {
+        "title": meta.get("title", ""),
+        "description": meta.get("description", ""),
+        "first_sentence": _first_sentence(text),
+        # Hugo derives the URL from the filename stem (slugified), not the
+        # frontmatter title. E.g. file "zen mode for writing.md" with title
+        # "Zen Mode for Writing (Obsidian, Neovim)" → /brain/zen-mode-for-writing/
+        "slug": slugify(Path(path).stem),
+    }
+
+
+def _prune_brain_index(index: NoteIndex) -> None:
+    """Only changed notes are looked up, so drop the ones deleted or renamed
+    since they were indexed by checking the indexed paths against the brain."""
+    index.prune({path for path in index.paths() if (BRAIN_CONTENT / path).exists()})
+
+
+def _brain_note_meta(paths: list[str]) -> dict[str, dict]:
+    """Parsed metadata for the given notes (relative to BRAIN_CONTENT).
+    Notes whose mtime and size match the note index are not read again;
+    the rest are parsed in parallel and written back to the index."""
+    index = NoteIndex("brain-notes.sqlite")
+    try:
+        stats = {path: (BRAIN_CONTENT / path).stat() for path in paths}
+        keys = {path: (st.st_mtime_ns, st.st_size) for path, st in stats.items()}
+        notes = index.get_many(keys)
+        missing = [path for path in paths if path not in notes]
+        if missing:
+            def parse(path):
+                text = (BRAIN_CONTENT / path).read_text(encoding="utf-8", errors="ignore")
+                return _parse_brain_note(path, text)
+
+            with ThreadPoolExecutor() as pool:
+                for path, meta in zip(missing, pool.map(parse, missing)):
+                    notes[path] = meta
+                    index.put(path, keys[path], meta)
+        _prune_brain_index(index)
+    finally:
+        index.close()
+    return notes
+
+
+def _brain_note_meta_from_git(paths: list[str]) -> dict[str, dict]:
+    """Like `_brain_note_meta`, but reads the blobs at HEAD and keys the
+    note index by blob hash. Paths that don't exist at HEAD are left out."""
+    index = NoteIndex("brain-notes.sqlite")
+    notes = {}
+    try:
+        with GitBlobReader(BRAIN_CONTENT) as blobs:
+            blob_by_path = {path: blobs.read(f"HEAD:{path}") for path in paths}
+        keys = {path: blob[0] for path, blob in blob_by_path.items() if blob}
+        notes = index.get_many(keys)
+        for path, sha in keys.items():
+            if path not in notes:
+                text = blob_by_path[path][1].decode("utf-8", errors="ignore")
+                notes[path] = _parse_brain_note(path, text)
+                index.put(path, sha, notes[path])
+        _prune_brain_index(index)
+    finally:
+        index.close()
+    return {path: notes[path] for path in paths if path in notes}
+
+
+class GitBlobReader:
+    """A single long-lived `git cat-file --batch` process. `read` sends one
+    object name and returns `(sha, content)`, or None if it doesn't exist."""
+
+    def __init__(self, repo: Path):
+        self.proc = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+    def read(self, name: str) -> tuple[str, bytes] | None:
+        self.proc.stdin.write(f"{name}\n".encode())
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().decode().rstrip("\n")
+        if header.endswith((" missing", " ambiguous")):
+            return None
+        sha, _type, size = header.rsplit(" ", 2)
+        content = self.proc.stdout.read(int(size))
+        self.proc.stdout.read(1)  # trailing newline
+        return sha, content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+def _rename_paths(path: str) -> tuple[str, str]:
+    """Old and new path of a numstat rename entry: `a.md => b.md`, or
+    `dir/{old => new}/note.md` with the common parts factored out."""
+    if "{" in path:
+        prefix, _, rest = path.partition("{")
+        middle, _, suffix = rest.partition("}")
+        old, new = middle.split(" => ", 1)
+        return (prefix + old + suffix).replace("//", "/"), (prefix + new + suffix).replace("//", "/")
+    old, new = path.split(" => ", 1)
+    return old, new
+
+
+def _sync_numstat_cache(numstat: NumstatCache) -> None:
+    """Run `git log --numstat` only for commits the cache hasn't seen yet —
+    nothing at all when HEAD hasn't moved since the last gather."""
+    head = subprocess.run(
+        ["git", "-C", str(BRAIN_CONTENT), "rev-parse", "HEAD"],
+        capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    if numstat.head == head:
+        return
+
+    if numstat.head and subprocess.run(
+        ["git", "-C", str(BRAIN_CONTENT), "merge-base", "--is-ancestor", numstat.head, head],
+        capture_output=True,
+    ).returncode != 0:
+        # last synced head is gone or no longer in HEAD's history (amend,
+        # rebase, force-push): its commits would be counted next to their
+        # rewritten copies, so start over
+        numstat.clear()
+
+    revs = [head]
+    if numstat.head:
+        revs.append(f"^{numstat.head}")  # only what was added since the last sync
+    result = subprocess.run(
+        ["git", "-C", str(BRAIN_CONTENT), "log", "--numstat", "--format=__COMMIT__%H|%ct|%ai", *revs],
+        capture_output=True, text=True, check=True,
+    )
+
+    known = numstat.known()
+    commit = None
+    for line in result.stdout.splitlines() + ["__COMMIT__"]:
+        if line.startswith("__COMMIT__"):
+            if commit and commit[0] not in known:
+                numstat.add(*commit)
+            rest = line.removeprefix("__COMMIT__")
+            if rest:
+                sha, committed_ts, authored = rest.split("|", 2)
+                commit = (sha, int(committed_ts), authored, [])
+            continue
+        parts = line.split("\t")
+        if len(parts) != 3 or not parts[0].isdigit():
+            continue
+        commit[3].append((parts[2], int(parts[0]), int(parts[1])))
+    numstat.set_head(head)
+
+
+def _first_sentence(text: str, max_chars: int = 200) -> str:
     """Fallback when frontmatter has no description."""
-    text = path.read_text(encoding="utf-8", errors="ignore")
     if text.startswith("---"):
         end = text.find("\n---", 4)
         if end >= 0:
@@ -154,7 +310,7 @@ def _first_sentence(path: Path, max_chars: int = 200) -> str:
         if not para or para.startswith(("#", "> [!", "-", "*", "|", "```")):
             continue
         # Strip wikilinks down to display text for the snippet
-        para = re.sub(r"\[\[([^\]|]+\|)?([^\]]+)\]\]", r"\2", para)
+        para = strip_wikilinks(para)
         para = re.sub(r"\s+", " ", para).strip()
         if len(para) > max_chars:
             para = para[:max_chars].rsplit(" ", 1)[0].rstrip(",.;:") + "…"
@@ -162,49 +318,85 @@ def _first_sentence(path: Path, max_chars: int = 200) -> str:
     return ""
 
 
-def _parse_brain_frontmatter(path: Path) -> dict:
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    if not text.startswith("---"):
-        return {}
-    end = text.find("\n---", 4)
-    if end < 0:
-        return {}
-    out = {}
-    for line in text[3:end].splitlines():
-        if ":" not in line:
-            continue
-        k, _, v = line.partition(":")
-        out[k.strip()] = v.strip().strip('"').strip("'")
-    return out
-
-
 # ----- Books -----
 
+_FICLONE = 0x40049409  # Linux ioctl to clone a file's extents
 _SKIP_BOOK_FOLDERS = {"Want to Read", "Not-read-anymore", "Goodread (Supplement)"}
 
 
 def _snapshot_books() -> Path | None:
     """Mirror just the .md files from BOOKS_DIR into .copy/books/ so the script
     never touches the live Second Brain. Returns the snapshot path, or None
-    if the source doesn't exist."""
+    if the source doesn't exist.
+
+    The mirror is incremental: a manifest of each source file's size and
+    mtime decides what to copy, files in the snapshot that are no longer in
+    the source are removed, and everything else is left alone."""
     if not BOOKS_DIR.exists():
         click.echo(f"BOOKS_DIR {BOOKS_DIR} not found, skipping books", err=True)
         return None
+    start = time.perf_counter()
     snapshot = COPY_DIR / "books"
-    if snapshot.exists():
-        shutil.rmtree(snapshot)
-    snapshot.mkdir(parents=True)
-    count = 0
+    manifest_path = COPY_DIR / "books.manifest.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() and snapshot.exists() else {}
+    snapshot.mkdir(parents=True, exist_ok=True)
+
+    current = {}
+    copied = skipped = 0
     for src in BOOKS_DIR.rglob("*.md"):
-        rel = src.relative_to(BOOKS_DIR)
+        rel = src.relative_to(BOOKS_DIR).as_posix()
+        st = src.stat()
+        current[rel] = [st.st_size, st.st_mtime_ns]
         dst = snapshot / rel
+        if manifest.get(rel) == current[rel] and dst.exists():
+            skipped += 1
+            continue
         dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, dst)
-        count += 1
-    click.echo(f"  snapshotted {count} book notes to {snapshot}")
+        _snapshot_file(src, dst)
+        copied += 1
+
+    # walk the snapshot itself rather than the manifest: after a first run,
+    # a lost manifest or an interrupted copy it may hold files no manifest lists
+    removed = 0
+    for dst in snapshot.rglob("*"):
+        if not dst.is_dir() and dst.relative_to(snapshot).as_posix() not in current:
+            dst.unlink()
+            removed += 1
+    for d in sorted((p for p in snapshot.rglob("*") if p.is_dir()), reverse=True):
+        if not any(d.iterdir()):
+            d.rmdir()
+
+    manifest_path.write_text(json.dumps(current))
+    click.echo(
+        f"  book snapshot {snapshot}: {copied} copied, {skipped} unchanged, "
+        f"{removed} removed in {time.perf_counter() - start:.2f}s"
+    )
     return snapshot
 
 
+def _snapshot_file(src: Path, dst: Path) -> None:
+    """Copy one file per BOOKS_SNAPSHOT_MODE. `reflink` clones the data
+    copy-on-write where the filesystem supports it (Btrfs, XFS); `hardlink`
+    shares the inode, which is fine because the snapshot is only ever read.
+    Both fall back to a plain copy."""
+    dst.unlink(missing_ok=True)
+    if BOOKS_SNAPSHOT_MODE == "hardlink":
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    elif BOOKS_SNAPSHOT_MODE == "reflink" and fcntl is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            dst.unlink(missing_ok=True)
+    shutil.copy2(src, dst)
+
+
 _BOOK_DATE_FIELDS = [
     ("Created", "Created"),
     ("Started", "Started reading"),
@@ -214,141 +406,163 @@ _BOOK_DATE_FIELDS = [
 
 def gather_books(since: datetime, limit: int = 5) -> list[dict]:
     """Books where any of Created / Started reading / Finished reading falls
-    after `since`. Reads from a local snapshot — never the live vault."""
+    after `since`. Reads from a local snapshot — never the live vault.
+
+    Parsed books are kept in a note index keyed by mtime and size, so only
+    books that changed since the last gather are read and parsed again."""
     snapshot = _snapshot_books()
     if snapshot is None:
         return []
 
-    books = []
-    for path in snapshot.rglob("*.md"):
-        if path.name.startswith("_"):
-            continue
-        rel = path.relative_to(snapshot).parts
-        if len(rel) > 1 and rel[0] in _SKIP_BOOK_FOLDERS:
-            continue
-
-        meta = _parse_book_inline_meta(path)
-
-        all_events = []  # every parseable date, for context
-        new_events = []  # dates that fall in this newsletter window
-        for label, key in _BOOK_DATE_FIELDS:
-            raw = meta.get(key, "")
-            m = re.search(r"(\d{4}-\d{2}-\d{2})", raw)
-            if not m:
+    index = NoteIndex("books.sqlite")
+    try:
+        paths = {}
+        for path in snapshot.rglob("*.md"):
+            if path.name.startswith("_"):
                 continue
-            try:
-                dt = datetime.fromisoformat(m.group(1))
-            except ValueError:
+            rel = path.relative_to(snapshot).parts
+            if len(rel) > 1 and rel[0] in _SKIP_BOOK_FOLDERS:
                 continue
-            iso = dt.date().isoformat()
-            all_events.append((label, iso))
-            if dt >= since:
-                new_events.append((label, iso))
+            st = path.stat()
+            paths[path.relative_to(snapshot).as_posix()] = (st.st_mtime_ns, st.st_size)
+
+        index.prune(paths)  # a full scan: anything else was deleted, renamed or moved to a skipped folder
+        parsed = index.get_many(paths)
+        for rel in paths.keys() - parsed.keys():
+            parsed[rel] = _parse_book((snapshot / rel).read_text(encoding="utf-8", errors="ignore"))
+            index.put(rel, paths[rel], parsed[rel])
+    finally:
+        index.close()
 
+    books = []
+    for rel in paths:  # walk order, so ties keep their old ordering
+        book = parsed[rel]
+        all_events = [tuple(event) for event in book["events"]]  # every parseable date, for context
+        # dates that fall in this newsletter window
+        new_events = [(label, iso) for label, iso in all_events if datetime.fromisoformat(iso) >= since]
         if not new_events:
             continue
 
         sort_dt = max(datetime.fromisoformat(iso) for _, iso in new_events)
 
         books.append({
-            "title": path.stem,
-            "author": meta.get("Author", "").strip("[]"),
-            "genre": meta.get("Genre", "").strip(),
+            "title": Path(rel).stem,
+            "author": book["author"],
+            "genre": book["genre"],
             "events": all_events,
             "new_events": new_events,
-            "summary": _extract_book_summary(path),
-            "notes": _extract_book_notes(path),
+            "summary": book["summary"],
+            "notes": _link_book_notes(book["notes"]),
             "sort_dt": sort_dt,
         })
 
-    books.sort(key=lambda b: b["sort_dt"], reverse=True)
-    return books[:limit]
+    return heapq.nlargest(limit, books, key=lambda b: b["sort_dt"])
+
+
+_BOOK_META_RE = re.compile(r"^\s*-\s+([A-Za-z][^:]*):\s*(.*)$")
+_BOOK_NOTES_RE = re.compile(r"##\s+Notes\s+During\s+Reading")
+_MD_LINK = re.compile(r"\[[^\]]*\]\([^)]*\)")
 
 
-def _parse_book_inline_meta(path: Path) -> dict:
-    out = {}
-    for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
-        m = re.match(r"^\s*-\s+([A-Za-z][^:]*):\s*(.*)$", line)
+def _parse_book(text: str) -> dict:
+    """Inline meta, the `> [!summary]` callout and the `## Notes During
+    Reading` section, collected in a single scan over the note."""
+    meta = {}
+    summary_lines = notes_lines = None
+    in_summary = in_notes = False
+    lines = text.split("\n")
+    last = len(lines) - 1
+    for i, line in enumerate(lines):
+        m = _BOOK_META_RE.match(line)
         if m:
-            out[m.group(1).strip()] = m.group(2).strip()
-    return out
+            meta[m.group(1).strip()] = m.group(2).strip()
+        if in_summary:
+            if line.startswith(">"):
+                summary_lines.append(line)
+            else:
+                in_summary = False
+        if in_notes:
+            # `##` alone on the last line is still body text
+            if line.startswith("##") and (line[2:3].isspace() or (line == "##" and i < last)):
+                in_notes = False  # next section
+            else:
+                notes_lines.append(line)
+        # a section header must be followed by a newline to have a body
+        if summary_lines is None and line.startswith("> [!summary]") and i < last:
+            summary_lines, in_summary = [], True
+        if notes_lines is None and _BOOK_NOTES_RE.match(line) and i < last:
+            notes_lines, in_notes = [], True
+
+    events = []
+    for label, key in _BOOK_DATE_FIELDS:
+        m = re.search(r"(\d{4}-\d{2}-\d{2})", meta.get(key, ""))
+        if not m:
+            continue
+        try:
+            dt = datetime.fromisoformat(m.group(1))
+        except ValueError:
+            continue
+        events.append((label, dt.date().isoformat()))
+
+    return {
+        "author": meta.get("Author", "").strip("[]"),
+        "genre": meta.get("Genre", "").strip(),
+        "events": events,
+        "summary": _book_summary(summary_lines),
+        "notes": _book_notes(notes_lines),
+    }
 
 
-def _extract_book_summary(path: Path) -> str:
-    """Pull the `> [!summary]` callout body."""
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    m = re.search(r"^> \[!summary\][^\n]*\n((?:^>.*\n?)*)", text, re.MULTILINE)
-    if not m:
+def _book_summary(lines: list[str] | None) -> str:
+    """Body of the `> [!summary]` callout, without the `>` markers."""
+    if lines is None:
         return ""
-    body = "\n".join(re.sub(r"^>\s?", "", ln) for ln in m.group(1).splitlines()).strip()
+    body = "\n".join(re.sub(r"^>\s?", "", ln) for ln in "\n".join(lines).splitlines()).strip()
     if body.lower() in {"todo", "tbd"} or "Write a summary" in body:
         return ""
     return body
 
 
-def _extract_book_notes(path: Path, max_chars: int = 800) -> str:
-    """Pull the `## Notes During Reading` body, dropping placeholders and
-    wikilink syntax (book notes may reference private-vault notes)."""
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    m = re.search(
-        r"^##\s+Notes\s+During\s+Reading[^\n]*\n(.*?)(?=^##\s|\Z)",
-        text, re.MULTILINE | re.DOTALL,
-    )
-    if not m:
+def _book_notes(lines: list[str] | None) -> str:
+    """Body of `## Notes During Reading`, dropping placeholders. Wikilinks are
+    kept and resolved by `_link_book_notes` when the draft is built."""
+    if lines is None:
         return ""
 
-    lines = []
-    for line in m.group(1).splitlines():
+    kept = []
+    for line in "\n".join(lines).splitlines():
         if line.strip() in {"", "-", "- ...", "-..."} or re.match(r"^-\s*\.{2,}$", line.strip()):
             continue
-        lines.append(line)
-    notes = "\n".join(lines).strip()
-
-    # Strip wikilink syntax to plain text (private-vault links can't be resolved publicly)
-    notes = re.sub(r"\[\[([^\]|]+\|)?([^\]]+)\]\]", r"\2", notes)
+        kept.append(line)
+    notes = "\n".join(kept).strip()
 
     # If the only remaining content is sub-headings, treat the section as empty
     if not any(ln.strip() and not ln.strip().startswith("#") for ln in notes.splitlines()):
         return ""
+    return notes
 
+
+def _link_book_notes(notes: str, max_chars: int = 800) -> str:
+    """Wikilinks to published brain notes become links, the rest plain text
+    (book notes may reference private-vault notes), then cut to `max_chars`
+    without splitting a link."""
+    notes = link_wikilinks(notes, BRAIN_BASE_URL, BRAIN_CONTENT, unresolved="text")
     if len(notes) > max_chars:
-        notes = notes[:max_chars].rsplit(" ", 1)[0] + "…"
+        cut = notes[:max_chars]
+        link = _MD_LINK.match(notes, cut.rfind("[")) if "[" in cut else None
+        if link and link.end() > max_chars:
+            cut = cut[:link.start()]
+        notes = cut.rsplit(" ", 1)[0] + "…"
     return notes.strip()
 
 
 # ----- Bluesky -----
 
 def gather_bluesky(since: datetime, top_n: int = BSKY_FETCH_AMOUNT) -> list[dict]:
-    url = (
-        f"https://public.api.bsky.app/xrpc/app.bsky.feed.getAuthorFeed"
-        f"?actor={BSKY_DID}&limit=100"
-    )
-    since_str = since.strftime("%Y-%m-%d")
     try:
-        rows = duckdb.sql(f"""
-            INSTALL httpfs; LOAD httpfs;
-            WITH raw AS (SELECT * FROM read_json_auto('{url}')),
-            unnested AS (SELECT unnest(feed) AS p FROM raw),
-            data AS (
-                SELECT
-                    p.post.uri AS uri,
-                    p.post.record.text AS text,
-                    p.post.record.createdAt AS created_at,
-                    p.post.replyCount AS replies,
-                    p.post.repostCount AS reposts,
-                    p.post.likeCount AS likes,
-                    p.post.quoteCount AS quotes,
-                    (p.post.replyCount + p.post.repostCount +
-                     p.post.likeCount  + p.post.quoteCount) AS engagement
-                FROM unnested
-                WHERE p.post.author.handle = '{BSKY_HANDLE}'
-            )
-            SELECT uri, text, created_at, engagement, replies, reposts, likes, quotes
-            FROM data
-            WHERE created_at >= '{since_str}'
-            ORDER BY engagement DESC
-            LIMIT {top_n}
-        """).fetchall()
+        with connect_store() as con:
+            sync_posts(con, since)
+            rows = top_posts(con, since, top_n)
     except Exception as e:
         click.echo(f"Bluesky fetch failed: {e}", err=True)
         return []
@@ -374,6 +588,7 @@ def gather_blog_posts(since: datetime) -> list:
     if not feed_url:
         return []
     try:
+        from listmonk_rss import fetch_rss_feed
         return fetch_rss_feed(feed_url, since)
     except Exception as e:
         click.echo(f"RSS fetch failed: {e}", err=True)
@@ -382,6 +597,55 @@ def gather_blog_posts(since: datetime) -> list:
 
 # ----- CLI -----
 
+def _run_gatherers(gatherers: dict, timeout: float) -> tuple[dict, dict]:
+    """Run the source gatherers concurrently. `timeout` is one deadline for
+    all of them, counted from the start: a source that raises or hasn't
+    finished by then contributes an empty list instead of blocking the
+    others. Returns the results and a printable timing per source."""
+    results, timings = {}, {}
+    done = queue.Queue()
+
+    def run(name, fn):
+        start = time.perf_counter()
+        try:
+            with span(f"gather {name}") as attrs:
+                out = fn()
+                attrs["items"] = len(out)
+        except Exception as e:
+            done.put((name, None, e, 0.0))
+        else:
+            done.put((name, out, None, time.perf_counter() - start))
+
+    started = time.perf_counter()
+    for name, fn in gatherers.items():
+        # daemon threads: a hung source must not keep the process from exiting
+        threading.Thread(target=run, args=(name, fn), name=f"gather-{name}", daemon=True).start()
+    # results and timings are only written here, so a source finishing
+    # after the deadline can't overwrite its "timeout"
+    while len(results) < len(gatherers):
+        remaining = timeout - (time.perf_counter() - started)
+        try:
+            name, out, error, elapsed = done.get(timeout=max(0.0, remaining))
+        except queue.Empty:
+            break
+        if error is not None:
+            click.echo(f"{name} failed: {error}", err=True)
+            results[name], timings[name] = [], "failed"
+        else:
+            results[name], timings[name] = out, f"{elapsed:.1f}s"
+    for name in [name for name in gatherers if name not in results]:
+        click.echo(f"{name} didn't finish within {timeout}s, leaving it out", err=True)
+        results[name], timings[name] = [], "timeout"
+    return {name: results[name] for name in gatherers}, {name: timings[name] for name in gatherers}
+
+
+def _profiling_options(command):
+    command = click.option("--trace", "trace_file", type=click.Path(dir_okay=False, path_type=Path), default=None,
+                           help="Write per-stage and per-HTTP-call timing spans to this JSON file")(command)
+    return click.option("--profile", is_flag=True,
+                        help="Run under cProfile and print the hot spots and a per-stage timing table")(command)
+
+
 @click.group()
 def cli():
     """Newsletter automation: gather → edit → send."""
@@ -398,77 +662,124 @@ def cli():
               help="Max blog posts (kept low since listmonk_rss.py already announces these)")
 @click.option("--books-limit", default=5, show_default=True)
 @click.option("--bluesky-top", default=15, show_default=True)
-def gather(since, threshold, brain_limit, blog_limit, books_limit, bluesky_top):
+@click.option("--timeout", default=GATHER_TIMEOUT, show_default=True,
+              help="Seconds to wait for the sources, all together, before leaving the unfinished ones out of the draft")
+@click.option("--brain-from-git/--brain-from-worktree", default=BRAIN_FROM_GIT,
+              help="Read brain notes as committed at HEAD instead of from disk (default: BRAIN_FROM_GIT env)")
+@_profiling_options
+def gather(since, threshold, brain_limit, blog_limit, books_limit, bluesky_top, timeout, brain_from_git,
+           profile, trace_file):
     """Build a draft markdown file from recent content."""
-    since_dt = datetime.fromisoformat(since) if since else get_last_newsletter_date()
-    click.echo(f"Gathering content since {since_dt.isoformat()}")
-
-    blog_posts = gather_blog_posts(since_dt)[:blog_limit]
-    brain_updates = gather_brain_updates(since_dt, threshold=threshold)[:brain_limit]
-    brain_major = [n for n in brain_updates if n["added"] >= MAJOR_BUCKET_LINES]
-    brain_minor = [n for n in brain_updates if n["added"] < MAJOR_BUCKET_LINES]
-    books = gather_books(since_dt, limit=books_limit)
-    bluesky = gather_bluesky(since_dt, top_n=bluesky_top)
-
-    click.echo(
-        f"  blog: {len(blog_posts)}  brain: {len(brain_updates)} "
-        f"(major: {len(brain_major)}, minor: {len(brain_minor)})  "
-        f"books: {len(books)}  bluesky: {len(bluesky)}"
-    )
-
-    if not any([blog_posts, brain_updates, books, bluesky]):
-        click.echo("Nothing to include. Skipping draft creation.")
-        return
-
-    today = datetime.now().date().isoformat()
-    out = Template(TEMPLATE_FILE.read_text()).render(
-        today=today,
-        blog_posts=blog_posts,
-        brain_major=brain_major,
-        brain_minor=brain_minor,
-        books=books,
-        bluesky=bluesky,
-    )
+    with traced_run("newsletter gather", profile, trace_file):
+        since_dt = datetime.fromisoformat(since) if since else get_last_newsletter_date()
+        click.echo(f"Gathering content since {since_dt.isoformat()}")
+
+        results, timings = _run_gatherers({
+            "blog": lambda: gather_blog_posts(since_dt)[:blog_limit],
+            "brain": lambda: gather_brain_updates(since_dt, threshold=threshold, from_git=brain_from_git)[:brain_limit],
+            "books": lambda: gather_books(since_dt, limit=books_limit),
+            "bluesky": lambda: gather_bluesky(since_dt, top_n=bluesky_top),
+        }, timeout=timeout)
+        blog_posts, brain_updates, books, bluesky = (
+            results["blog"], results["brain"], results["books"], results["bluesky"]
+        )
+        brain_major = [n for n in brain_updates if n["added"] >= MAJOR_BUCKET_LINES]
+        brain_minor = [n for n in brain_updates if n["added"] < MAJOR_BUCKET_LINES]
+
+        click.echo(
+            f"  blog: {len(blog_posts)} ({timings['blog']})  brain: {len(brain_updates)} "
+            f"(major: {len(brain_major)}, minor: {len(brain_minor)}) ({timings['brain']})  "
+            f"books: {len(books)} ({timings['books']})  bluesky: {len(bluesky)} ({timings['bluesky']})"
+        )
+
+        if not any([blog_posts, brain_updates, books, bluesky]):
+            click.echo("Nothing to include. Skipping draft creation.")
+            return
+
+        today = datetime.now().date().isoformat()
+        with span("render"):
+            from listmonk_rss import load_template
+            out = load_template(TEMPLATE_FILE).render(
+                today=today,
+                blog_posts=blog_posts,
+                brain_major=brain_major,
+                brain_minor=brain_minor,
+                books=books,
+                bluesky=bluesky,
+            )
 
-    DRAFTS_DIR.mkdir(exist_ok=True)
-    out_path = DRAFTS_DIR / f"newsletter-{today}.md"
-    out_path.write_text(out)
-    click.echo(f"\nDraft written: {out_path}")
-    click.echo(f"Edit it, then run:  uv run python newsletter.py send {out_path}")
+        DRAFTS_DIR.mkdir(exist_ok=True)
+        out_path = DRAFTS_DIR / f"newsletter-{today}.md"
+        out_path.write_text(out)
+        click.echo(f"\nDraft written: {out_path}")
+        click.echo(f"Edit it, then run:  uv run python newsletter.py send {out_path}")
 
 
 @cli.command()
 @click.argument("draft", type=click.Path(exists=True, path_type=Path))
 @click.option("--subject", default=None, help="Email subject (default: '[ssp.sh] Newsletter — <Month YYYY>')")
 @click.option("--dry-run", is_flag=True, help="Push to Listmonk with a 10-year delay (for testing)")
-def send(draft, subject, dry_run):
+@_profiling_options
+def send(draft, subject, dry_run, profile, trace_file):
     """Push an edited draft to Listmonk as a scheduled campaign."""
-    content = draft.read_text()
-    if subject is None:
-        subject = f"[ssp.sh] Newsletter — {datetime.now().strftime('%B %Y')}"
-
-    list_id = get_list_id(
-        host=os.getenv("LISTMONK_HOST"),
-        api_user=os.getenv("LISTMONK_API_USER"),
-        api_token=os.getenv("LISTMONK_API_TOKEN"),
-        list_name=os.getenv("LIST_NAME"),
-    )
+    from listmonk_client import ListmonkClient
+    from listmonk_rss import get_list_id, schedule_campaign
+
+    with traced_run("newsletter send", profile, trace_file):
+        content = draft.read_text()
+        if subject is None:
+            subject = f"[ssp.sh] Newsletter — {datetime.now().strftime('%B %Y')}"
+
+        with ListmonkClient.from_env() as listmonk:
+            list_id = get_list_id(listmonk, list_name=os.getenv("LIST_NAME"))
+
+            success = schedule_campaign(
+                listmonk,
+                list_id=list_id,
+                content=content,
+                subject=subject,
+                dry_run=dry_run,
+            )
+
+        if success and not dry_run:
+            save_last_newsletter_date(datetime.now())
+            click.echo("✓ .last_newsletter advanced")
+        elif dry_run:
+            click.echo("✓ dry run — .last_newsletter NOT advanced")
 
-    success = schedule_campaign(
-        host=os.getenv("LISTMONK_HOST"),
-        api_user=os.getenv("LISTMONK_API_USER"),
-        api_token=os.getenv("LISTMONK_API_TOKEN"),
-        list_id=list_id,
-        content=content,
-        subject=subject,
-        dry_run=dry_run,
-    )
 
-    if success and not dry_run:
-        save_last_newsletter_date(datetime.now())
-        click.echo("✓ .last_newsletter advanced")
-    elif dry_run:
-        click.echo("✓ dry run — .last_newsletter NOT advanced")
+@cli.command("bsky-stats")
+@click.option("--since", default=None,
+              help="Window start (YYYY-MM-DD). Default: read from .last_newsletter")
+@click.option("--top", default=20, show_default=True)
+@click.option("--by", type=click.Choice(["gained", "total", "day"]), default="gained", show_default=True,
+              help="gained: engagement won since --since; total: current counts of posts created since; "
+                   "day: engagement gained per day")
+@click.option("--sync", is_flag=True, help="Fetch recent posts from Bluesky first (otherwise no API calls)")
+def bsky_stats(since, top, by, sync):
+    """Query the local Bluesky engagement history."""
+    since_dt = datetime.fromisoformat(since) if since else get_last_newsletter_date()
+    with connect_store() as con:
+        if sync:
+            sync_posts(con, since_dt)
+        if by == "day":
+            for day, gained, posts in engagement_by_day(con, since_dt):
+                click.echo(f"{day}  +{gained:<5} across {posts} posts")
+            return
+        if by == "gained":
+            rows = [(uri, text, gained, eng, likes, reposts, replies)
+                    for uri, text, _c, gained, eng, replies, reposts, likes, _q
+                    in engagement_gained(con, since_dt, top)]
+        else:
+            rows = [(uri, text, eng, eng, likes, reposts, replies)
+                    for uri, text, _c, eng, replies, reposts, likes, _q in top_posts(con, since_dt, top)]
+    for uri, text, score, eng, likes, reposts, replies in rows:
+        rkey = uri.rsplit("/", 1)[-1]
+        prefix = f"+{score:<4}" if by == "gained" else f"{score:>4}"
+        click.echo(
+            f"{prefix} {eng:>4}  💜{likes:>3} 🔁{reposts:>2} 💬{replies:>2}  "
+            f"{(text or '').strip()[:90]}  https://bsky.app/profile/{BSKY_HANDLE}/post/{rkey}"
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+"""What `listmonk_rss.py` has already announced.
+
+Two interchangeable backends, picked with STATE_BACKEND:
+
+- `github` (default): the `LAST_UPDATE` repository variable. Only a
+  watermark — an entry is new if it was published after the last send.
+- `sqlite`: a local database with the watermark plus the GUID (or link) of
+  every announced entry. An entry is new if its GUID hasn't been sent, so
+  edited posts are not re-sent and backdated posts are still picked up. In
+  GitHub Actions the file is kept with `actions/cache`, which can be evicted,
+  so with GH_TOKEN set every send also moves `LAST_UPDATE`; a lost database
+  is re-seeded from it and only backdated posts can be announced twice.
+
+`cutoff` is the publication date at or before which no entry can be new,
+so a newest-first scan can stop there.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+from dotenv import load_dotenv
+
+from listmonk_client import shared_client
+
+load_dotenv()
+
+STATE_BACKEND = os.getenv("STATE_BACKEND") or "github"  # Actions exports undefined variables as ""
+STATE_DB = Path(os.getenv("STATE_DB", Path(__file__).parent / ".state" / "listmonk_rss.sqlite"))
+
+
+def _github_variable_request(method: str, name: str | None = None, **kwargs) -> httpx.Response:
+    github_token = os.getenv("GH_TOKEN")
+    repo = os.getenv("GH_REPOSITORY")
+    url = f"https://api.github.com/repos/{repo}/actions/variables"
+    if name:
+        url = f"{url}/{name}"
+
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "Authorization": f"Bearer {github_token}",
+        "X-GitHub-Api-Version": "2022-11-28"
+    }
+    return shared_client().request(method, url, headers=headers, **kwargs)
+
+
+def get_last_update(variable: str = "LAST_UPDATE") -> datetime:
+    """Get the last update timestamp from GitHub repo variable."""
+    try:
+        response = _github_variable_request("GET", variable)
+        response.raise_for_status()
+        data = response.json()
+        return datetime.fromisoformat(data["value"])
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return datetime.min
+        raise
+
+
+def save_last_update(timestamp: datetime, variable: str = "LAST_UPDATE"):
+    """Save the last update timestamp to GitHub repo variable, creating the
+    variable if it doesn't exist yet."""
+    data = {
+        "name": variable,
+        "value": timestamp.isoformat()
+    }
+    response = _github_variable_request("PATCH", variable, json=data)
+    if response.status_code == 404:
+        response = _github_variable_request("POST", json=data)
+    response.raise_for_status()
+    logging.info(f"Saved last update timestamp to GitHub repo variable {variable}")
+
+
+def entry_key(entry) -> str:
+    """Stable identity of a feed entry: its GUID, or the link if it has none."""
+    return entry.get("id") or entry.get("link")
+
+
+class GitHubVariableState:
+    """Watermark-only state in a repository variable (`LAST_UPDATE` by default)."""
+
+    def __init__(self, variable: str = "LAST_UPDATE"):
+        self.variable = variable
+        self.name = f"GitHub variable {variable}"
+        self.watermark = get_last_update(variable)
+
+    @property
+    def cutoff(self) -> datetime:
+        return self.watermark
+
+    def is_new(self, key: str, published: datetime) -> bool:
+        return published > self.watermark
+
+    def mark_sent(self, keys: list[str], timestamp: datetime) -> None:
+        save_last_update(timestamp, self.variable)
+        self.watermark = timestamp
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteState:
+    """Watermark plus the set of announced entry keys, in a local SQLite file.
+
+    `floor` is the watermark the database started from. Unsent entries
+    published before it predate the database and are treated as announced;
+    anything after it is new unless its key is in the set.
+    """
+
+    def __init__(self, path: Path = STATE_DB, variable: str = "LAST_UPDATE"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.name = str(path)
+        self.variable = variable
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS sent (key TEXT PRIMARY KEY, sent_at TEXT NOT NULL)")
+        meta = dict(self.db.execute("SELECT name, value FROM meta"))
+        if "floor" not in meta:
+            floor = get_last_update(variable) if os.getenv("GH_TOKEN") else datetime.min
+            meta = {"floor": floor.isoformat(), "watermark": floor.isoformat()}
+            self.db.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+            self.db.commit()
+        self.floor = datetime.fromisoformat(meta["floor"])
+        self.watermark = datetime.fromisoformat(meta["watermark"])
+        self.sent = {key for (key,) in self.db.execute("SELECT key FROM sent")}
+
+    @property
+    def cutoff(self) -> datetime:
+        # backdated entries between floor and watermark can still be new
+        return self.floor
+
+    def is_new(self, key: str, published: datetime) -> bool:
+        return published > self.floor and key not in self.sent
+
+    def mark_sent(self, keys: list[str], timestamp: datetime) -> None:
+        now = timestamp.isoformat()
+        self.db.executemany("INSERT OR IGNORE INTO sent VALUES (?, ?)", [(k, now) for k in keys])
+        self.db.execute("UPDATE meta SET value = ? WHERE name = 'watermark'", (now,))
+        self.db.commit()
+        self.sent.update(keys)
+        self.watermark = timestamp
+        if os.getenv("GH_TOKEN"):
+            # the fallback the database is re-seeded from if it gets lost
+            save_last_update(timestamp, self.variable)
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def get_state_store(backend: str = STATE_BACKEND, feed_name: str | None = None):
+    """State for the default feed, or for `feed_name` in a multi-feed config —
+    each named feed gets its own `LAST_UPDATE_<NAME>` variable or database."""
+    variable = "LAST_UPDATE"
+    path = STATE_DB
+    if feed_name:
+        key = re.sub(r"[^A-Za-z0-9]+", "_", feed_name).strip("_")
+        variable = f"LAST_UPDATE_{key.upper()}"
+        path = STATE_DB.with_name(f"{key.lower()}.sqlite")
+    if backend == "github":
+        return GitHubVariableState(variable)
+    if backend == "sqlite":
+        return SqliteState(path, variable)
+    raise ValueError(f"Unknown STATE_BACKEND '{backend}', expected 'github' or 'sqlite'")
@@ -0,0 +1,119 @@
+"""Lightweight timing spans and an optional cProfile run for both CLIs.
+
+Code marks its stages with `span("opengraph", urls=12)`. Every HTTP call made
+through `listmonk_client.make_http_client` is recorded as an `http <host>`
+span with method, status, bytes and latency. Spans are kept in memory, so
+recording is cheap enough to be always on. `traced_run` prints them as a
+summary table and/or writes them as a JSON trace at the end of a run, and
+with `profile` also runs the command under cProfile.
+"""
+
+import io
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from cache import CACHE_DIR
+
+PROFILE_DIR = CACHE_DIR / "profiles"
+PROFILE_TOP = 30  # functions printed by --profile
+
+_spans: list[dict] = []
+_lock = threading.Lock()
+_origin = time.perf_counter()
+
+
+def record(name: str, seconds: float, **attrs) -> None:
+    """Add a finished span. Thread-safe."""
+    entry = {
+        "name": name,
+        "start_ms": round((time.perf_counter() - _origin - seconds) * 1000, 3),
+        "ms": round(seconds * 1000, 3),
+        "thread": threading.current_thread().name,
+        **attrs,
+    }
+    with _lock:
+        _spans.append(entry)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the block as one span. Yields the attribute dict, so the block
+    can add what it only learns along the way (`attrs["items"] = n`)."""
+    start = time.perf_counter()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        record(name, time.perf_counter() - start, **attrs)
+
+
+def spans() -> list[dict]:
+    with _lock:
+        return list(_spans)
+
+
+def summary() -> list[dict]:
+    """Spans grouped by name: count, total/max latency and bytes."""
+    groups = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0, "errors": 0})
+    for s in spans():
+        g = groups[s["name"]]
+        g["count"] += 1
+        g["total_ms"] += s["ms"]
+        g["max_ms"] = max(g["max_ms"], s["ms"])
+        g["bytes"] += s.get("bytes", 0)
+        g["errors"] += "error" in s
+    return [{"name": name, **g} for name, g in sorted(groups.items(), key=lambda kv: -kv[1]["total_ms"])]
+
+
+def print_summary(file=sys.stderr) -> None:
+    print(f"\n{'span':<36} {'count':>6} {'total ms':>10} {'max ms':>9} {'KB':>9} {'errors':>6}", file=file)
+    for g in summary():
+        print(
+            f"{g['name'][:36]:<36} {g['count']:>6} {g['total_ms']:>10.1f} {g['max_ms']:>9.1f} "
+            f"{g['bytes'] / 1024:>9.1f} {g['errors']:>6}",
+            file=file,
+        )
+
+
+def write_trace(path: Path, command: str) -> None:
+    path.write_text(json.dumps({"command": command, "spans": spans(), "summary": summary()}, indent=2))
+
+
+@contextmanager
+def traced_run(command: str, profile: bool = False, trace_file: Path | None = None):
+    """Run a CLI command with optional cProfile and span output.
+
+    cProfile only sees the calling thread; work done in thread pools shows up
+    as time spent waiting on their futures, the spans cover the rest."""
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        with span(command):
+            yield
+    finally:
+        if profiler:
+            profiler.disable()
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            out = PROFILE_DIR / f"{command.replace(' ', '-')}-{datetime.now():%Y%m%d-%H%M%S}.prof"
+            profiler.dump_stats(out)
+            import pstats
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            print(stream.getvalue(), file=sys.stderr)
+            print(f"cProfile output written: {out} (open with `python -m pstats` or snakeviz)", file=sys.stderr)
+        if profile or trace_file:
+            print_summary()
+        if trace_file:
+            write_trace(trace_file, command)
+            print(f"Trace written: {trace_file}", file=sys.stderr)